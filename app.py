@@ -23,9 +23,9 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 import streamlit as st
-from core.config import get_config
+from core.config import MAJOR_KEY_MAP, get_config
 from core.user_manager import get_user_manager, UserSession
-from views import render_resume_builder, render_digital_twin, render_ai_copilot, render_admin_dashboard
+import views
 
 # 配置日志
 logging.basicConfig(
@@ -37,6 +37,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 可查看统计数据的角色
+_STAFF_ROLES = frozenset({"admin", "teacher"})
+
 
 def safe_render(render_func: Callable, tab_name: str) -> None:
     """安全渲染页面，捕获异常并显示友好错误信息"""
@@ -73,8 +76,6 @@ def render_auth_sidebar() -> bool:
     Returns:
         是否已登录
     """
-    user_mgr = get_user_manager()
-
     with st.sidebar:
         st.markdown("### 👤 用户中心")
 
@@ -93,6 +94,7 @@ def render_auth_sidebar() -> bool:
             return True
 
         # 未登录：显示登录/注册表单
+        user_mgr = get_user_manager()
         auth_mode = st.radio(
             "选择操作",
             ["登录", "注册"],
@@ -209,22 +211,14 @@ def _render_register_form(user_mgr) -> None:
 
 def _get_major_key(major_display_name: str) -> str:
     """将显示名称转换为专业 key"""
-    major_map = {
-        "新闻学": "journalism",
-        "广告学": "advertising",
-        "网络与新媒体": "new_media",
-        "广播电视学": "broadcasting"
-    }
-    return major_map.get(major_display_name, "journalism")
+    return MAJOR_KEY_MAP.get(major_display_name, "journalism")
 
 
 def render_admin_stats() -> None:
     """渲染管理员统计面板（侧边栏）"""
-    if "user_session" not in st.session_state:
-        return
-
-    session = st.session_state.user_session
-    if session.user.role not in ["admin", "teacher"]:
+    # 先按角色过滤，学生和游客不触发任何统计计算
+    session = st.session_state.get("user_session")
+    if not session or session.user.role not in _STAFF_ROLES:
         return
 
     user_mgr = get_user_manager()
@@ -283,7 +277,7 @@ def main():
     st.session_state.current_user_major = session.user.major
 
     # 根据角色显示不同的标签页
-    is_admin = session.user.role in ["admin", "teacher"]
+    is_admin = session.user.role in _STAFF_ROLES
 
     if is_admin:
         # 管理员/教师：显示四个标签页
@@ -303,17 +297,17 @@ def main():
         tab4 = None
 
     with tab1:
-        safe_render(render_resume_builder, "智能简历工坊")
+        safe_render(views.render_resume_builder, "智能简历工坊")
 
     with tab2:
-        safe_render(render_digital_twin, "成长数字孪生")
+        safe_render(views.render_digital_twin, "成长数字孪生")
 
     with tab3:
-        safe_render(render_ai_copilot, "AI 教学 Copilot")
+        safe_render(views.render_ai_copilot, "AI 教学 Copilot")
 
     if tab4:
         with tab4:
-            safe_render(render_admin_dashboard, "数据统计")
+            safe_render(views.render_admin_dashboard, "数据统计")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,13 @@
 # Core module initialization
 from .config import Config, get_config
 from .data_manager import DataManager
-from .rag_engine import RAGEngine, get_rag_engine
 
 __all__ = ['Config', 'get_config', 'DataManager', 'RAGEngine', 'get_rag_engine']
+
+
+def __getattr__(name):
+    # rag_engine 依赖 numpy/sklearn，导入较慢，仅在首次访问时加载
+    if name in ('RAGEngine', 'get_rag_engine'):
+        from . import rag_engine
+        return getattr(rag_engine, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,13 +4,20 @@ AI 内容提炼服务模块
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
-from typing import Dict, Any, Optional
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Optional
 from dataclasses import dataclass
 
-import requests
+from . import json_utils
+from .config import get_config
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +25,25 @@ logger = logging.getLogger(__name__)
 API_BASE_URL = "http://127.0.0.1:8317/v1"
 DEFAULT_MODEL = "gemini-3-pro-preview"
 
+# AI 结果磁盘缓存（data/ai_cache）：缓存内容包含学生简历等个人信息，
+# 超过保留期的条目在读取和写入时删除，条目数超过上限时删除最旧的
+AI_CACHE_TTL = 7 * 24 * 3600  # 保留 7 天
+AI_CACHE_MAX_ENTRIES = 200
 
-@dataclass
+# 从 AI 回复中提取 JSON 的正则（预编译）
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+_JSON_BRACE_RE = re.compile(r'\{[\s\S]*\}')
+
+# 各专业在提示词中的侧重说明（只读）
+_MAJOR_HINTS = MappingProxyType({
+    "journalism": "新闻学 - 关注采访、写作、调查报道能力",
+    "advertising": "广告学 - 关注创意策划、品牌营销、文案能力",
+    "new_media": "网络与新媒体 - 关注新媒体运营、数据分析、技术能力",
+    "broadcasting": "广播电视学 - 关注视频制作、导演、摄影能力",
+})
+
+
+@dataclass(frozen=True)
 class AIConfig:
     """AI 服务配置"""
     api_key: str
@@ -29,8 +53,26 @@ class AIConfig:
     max_tokens: int = 4000
 
 
+# 共享的 HTTP 会话，复用连接池，避免每次请求都重新建立 TCP/TLS 连接
+_session = None
+
+
+def _get_session():
+    """获取共享的 requests.Session（首次使用时创建）"""
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+
+@lru_cache(maxsize=1)
 def get_ai_config() -> AIConfig:
-    """从环境变量或 Streamlit secrets 获取 AI 配置"""
+    """从环境变量或 Streamlit secrets 获取 AI 配置
+
+    结果在进程内缓存，避免每次调用都重新读取 secrets 和环境变量；
+    返回的配置为不可变对象，可安全共享。
+    """
     try:
         import streamlit as st
         api_key = st.secrets.get("CLIPROXY_API_KEY", os.getenv("CLIPROXY_API_KEY", ""))
@@ -110,10 +152,122 @@ RESUME_EXTRACTION_PROMPT = """你是一个专业的简历内容提炼助手。
 """
 
 
+def _chat_completion(
+    config: AIConfig,
+    payload: Dict[str, Any],
+    timeout: int,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> str:
+    """调用 chat/completions 接口，返回完整的回复文本
+
+    以 SSE 流式接收回复，不必等待整个生成结束才有反馈；
+    每收到一段内容都会以累计字符数调用 on_progress。
+    服务端未返回事件流时按普通 JSON 响应处理。
+
+    Raises:
+        requests.exceptions.RequestException: 网络或 HTTP 错误
+        KeyError, json.JSONDecodeError: 响应格式不符合预期
+    """
+    headers = {
+        "Authorization": f"Bearer {config.api_key}",
+        "Content-Type": "application/json"
+    }
+
+    with _get_session().post(
+        f"{config.base_url}/chat/completions",
+        headers=headers,
+        json={**payload, "stream": True},
+        timeout=timeout,
+        stream=True
+    ) as response:
+        response.raise_for_status()
+
+        if "text/event-stream" not in response.headers.get("Content-Type", ""):
+            result = response.json()
+            return result["choices"][0]["message"]["content"]
+
+        parts: List[str] = []
+        received = 0
+        for line in response.iter_lines():
+            # SSE 格式：每个事件一行 "data: {...}"，以 "data: [DONE]" 结束
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                break
+
+            choices = json_utils.loads(data).get("choices") or []
+            delta = choices[0].get("delta", {}).get("content") if choices else None
+            if delta:
+                parts.append(delta)
+                received += len(delta)
+                if on_progress is not None:
+                    on_progress(received)
+
+        return "".join(parts)
+
+
+def _get_cache_path(payload: Dict[str, Any]) -> Path:
+    """按请求内容（模型、提示词、温度等）的 SHA-256 计算缓存文件路径"""
+    key = hashlib.sha256(json_utils.dumps(payload).encode('utf-8')).hexdigest()
+    return get_config().paths.ai_cache / f"{key}.json"
+
+
+def _load_cached_result(payload: Dict[str, Any]) -> Optional[Any]:
+    """读取相同请求的缓存结果，未命中返回 None"""
+    path = _get_cache_path(payload)
+    try:
+        if time.time() - path.stat().st_mtime > AI_CACHE_TTL:
+            path.unlink(missing_ok=True)
+            return None
+        return json_utils.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable AI cache entry {path.name}: {e}")
+        return None
+
+
+def _save_cached_result(payload: Dict[str, Any], result: Any) -> None:
+    """缓存解析成功的 AI 结果，写入失败不影响主流程"""
+    path = _get_cache_path(payload)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json_utils.dumps(result), encoding='utf-8')
+    except OSError as e:
+        logger.warning(f"Failed to write AI cache entry {path.name}: {e}")
+        return
+    _prune_cache(path.parent)
+
+
+def _prune_cache(cache_dir: Path) -> None:
+    """删除过期的缓存条目，并把条目数控制在 AI_CACHE_MAX_ENTRIES 以内"""
+    now = time.time()
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    entries.append((entry.stat().st_mtime, entry.path))
+    except OSError as e:
+        logger.warning(f"Failed to scan AI cache: {e}")
+        return
+
+    # 按修改时间从新到旧排序，保留未过期的最新条目
+    entries.sort(reverse=True)
+    for i, (mtime, entry_path) in enumerate(entries):
+        if i >= AI_CACHE_MAX_ENTRIES or now - mtime > AI_CACHE_TTL:
+            try:
+                os.unlink(entry_path)
+            except OSError:
+                pass
+
+
 def extract_resume_from_text(
     user_input: str,
     major: str = "journalism",
-    config: Optional[AIConfig] = None
+    config: Optional[AIConfig] = None,
+    on_progress: Optional[Callable[[int], None]] = None
 ) -> Dict[str, Any]:
     """
     使用 AI 从学生自然语言输入中提取结构化简历数据
@@ -122,6 +276,7 @@ def extract_resume_from_text(
         user_input: 学生的自然语言描述
         major: 专业类型，用于调整提取策略
         config: AI 配置，默认从环境变量获取
+        on_progress: 流式接收回复时的进度回调，参数为已接收字符数
 
     Returns:
         结构化的简历 JSON 数据
@@ -133,11 +288,7 @@ def extract_resume_from_text(
         logger.warning("No API key configured, returning template")
         return _get_template_resume(major)
 
-    # 构建请求
-    headers = {
-        "Authorization": f"Bearer {config.api_key}",
-        "Content-Type": "application/json"
-    }
+    import requests
 
     # 根据专业调整提示词
     major_hint = _get_major_hint(major)
@@ -153,20 +304,18 @@ def extract_resume_from_text(
         "max_tokens": config.max_tokens
     }
 
-    try:
-        response = requests.post(
-            f"{config.base_url}/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
-        response.raise_for_status()
+    # 相同输入重复提交时直接返回缓存结果，跳过网络请求
+    cached = _load_cached_result(payload)
+    if cached is not None:
+        logger.info("AI resume extraction served from cache")
+        return cached
 
-        result = response.json()
-        content = result["choices"][0]["message"]["content"]
+    try:
+        content = _chat_completion(config, payload, timeout=60, on_progress=on_progress)
 
         # 提取 JSON
         resume_data = _parse_json_from_response(content)
+        _save_cached_result(payload, resume_data)
         return resume_data
 
     except requests.exceptions.RequestException as e:
@@ -179,27 +328,27 @@ def extract_resume_from_text(
 
 def _parse_json_from_response(content: str) -> Dict[str, Any]:
     """从 AI 响应中提取 JSON"""
-    # 尝试直接解析
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        pass
+    # 尝试直接解析（只有以 { 或 [ 开头时才可能成功）
+    if content.lstrip().startswith(('{', '[')):
+        try:
+            return json_utils.loads(content)
+        except json_utils.JSONDecodeError:
+            pass
 
     # 尝试提取 ```json ... ``` 代码块
-    import re
-    json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
+    json_match = _JSON_BLOCK_RE.search(content)
     if json_match:
         try:
-            return json.loads(json_match.group(1))
-        except json.JSONDecodeError:
+            return json_utils.loads(json_match.group(1))
+        except json_utils.JSONDecodeError:
             pass
 
     # 尝试找到 { ... } 结构
-    brace_match = re.search(r'\{[\s\S]*\}', content)
+    brace_match = _JSON_BRACE_RE.search(content)
     if brace_match:
         try:
-            return json.loads(brace_match.group(0))
-        except json.JSONDecodeError:
+            return json_utils.loads(brace_match.group(0))
+        except json_utils.JSONDecodeError:
             pass
 
     raise AIServiceError("无法从 AI 响应中提取有效的 JSON 数据")
@@ -207,13 +356,7 @@ def _parse_json_from_response(content: str) -> Dict[str, Any]:
 
 def _get_major_hint(major: str) -> str:
     """获取专业提示"""
-    hints = {
-        "journalism": "新闻学 - 关注采访、写作、调查报道能力",
-        "advertising": "广告学 - 关注创意策划、品牌营销、文案能力",
-        "new_media": "网络与新媒体 - 关注新媒体运营、数据分析、技术能力",
-        "broadcasting": "广播电视学 - 关注视频制作、导演、摄影能力"
-    }
-    return hints.get(major, "新闻传播学")
+    return _MAJOR_HINTS.get(major, "新闻传播学")
 
 
 def _get_template_resume(major: str) -> Dict[str, Any]:
@@ -272,18 +415,13 @@ def optimize_resume_section(
     prompt = f"""请优化以下简历的 "{section_name}" 部分。
 
 当前内容:
-{json.dumps(section_data, ensure_ascii=False, indent=2)}
+{json_utils.dumps(section_data, indent=True)}
 
 用户要求:
 {user_feedback}
 
 请输出优化后的 JSON 数据（只输出 JSON，保持相同结构）："""
 
-    headers = {
-        "Authorization": f"Bearer {config.api_key}",
-        "Content-Type": "application/json"
-    }
-
     payload = {
         "model": config.model,
         "messages": [
@@ -293,18 +431,15 @@ def optimize_resume_section(
         "max_tokens": 2000
     }
 
-    try:
-        response = requests.post(
-            f"{config.base_url}/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        response.raise_for_status()
+    cached = _load_cached_result(payload)
+    if cached is not None:
+        return cached
 
-        result = response.json()
-        content = result["choices"][0]["message"]["content"]
-        return _parse_json_from_response(content)
+    try:
+        content = _chat_completion(config, payload, timeout=30)
+        optimized = _parse_json_from_response(content)
+        _save_cached_result(payload, optimized)
+        return optimized
 
     except Exception as e:
         logger.error(f"Section optimization failed: {e}")
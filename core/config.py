@@ -8,11 +8,14 @@
 - RAGConfig: RAG 引擎配置
 - Config: 全局配置管理器（单例模式）
 """
-import json
 import logging
+import sys
 from pathlib import Path
+from types import MappingProxyType
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Mapping, Optional, Tuple
+
+from . import json_utils
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -20,77 +23,88 @@ logger = logging.getLogger(__name__)
 # 获取项目根目录
 ROOT_DIR = Path(__file__).parent.parent
 
-
-@dataclass
+# Python 3.10+ 上为数据类启用 __slots__，减少实例内存并加快属性访问
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# 专业预设
+MAJOR_PRESETS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "自定义": MappingProxyType({"layout": "modern", "theme": "rose", "font": "sans"}),
+    "广告学 (Agency)": MappingProxyType({"layout": "agency", "theme": "luxury", "font": "sans"}),
+    "新闻学 (Classic)": MappingProxyType({"layout": "classic", "theme": "academic", "font": "serif"}),
+    "网新 (Modern)": MappingProxyType({"layout": "modern", "theme": "teal", "font": "sans"}),
+    "广播电视 (Visual)": MappingProxyType({"layout": "visual", "theme": "violet", "font": "sans"}),
+})
+
+# 专业显示名称 -> 专业 key
+MAJOR_KEY_MAP: Mapping[str, str] = MappingProxyType({
+    "新闻学": "journalism",
+    "广告学": "advertising",
+    "网络与新媒体": "new_media",
+    "广播电视学": "broadcasting",
+})
+
+# 模板映射
+TEMPLATE_MAP: Mapping[str, str] = MappingProxyType({
+    "modern": "template.html",
+    "classic": "template_classic.html",
+    "agency": "template_agency.html",
+    "visual": "template_visual.html",
+})
+
+# 配色主题
+THEMES: Tuple[str, ...] = ("rose", "teal", "indigo", "violet", "academic", "luxury")
+
+# 布局选项
+LAYOUTS: Tuple[str, ...] = ("modern", "classic", "agency", "visual")
+
+
+@dataclass(**_SLOTS)
 class PathConfig:
-    """路径配置"""
-    root: Path = field(default_factory=lambda: ROOT_DIR)
-
-    @property
-    def templates(self) -> Path:
-        return self.root / "templates"
-
-    @property
-    def data(self) -> Path:
-        return self.root / "data"
-
-    @property
-    def students(self) -> Path:
-        return self.data / "students"
-
-    @property
-    def corpus(self) -> Path:
-        return self.root / "assets" / "corpus"
+    """路径配置
 
-    @property
-    def config(self) -> Path:
-        return self.root / "config"
-
-    @property
-    def competency_matrix(self) -> Path:
-        return self.config / "competency_matrix.json"
-
-    @property
-    def cv_configs(self) -> Path:
-        return self.root / "journalism_cv"
-
-
-@dataclass
+    各子路径在初始化时一次性解析为普通属性，
+    避免每次访问都重新拼接 Path。
+    """
+    root: Path = field(default_factory=lambda: ROOT_DIR)
+    templates: Path = field(init=False)
+    data: Path = field(init=False)
+    students: Path = field(init=False)
+    ai_cache: Path = field(init=False)
+    rag_cache: Path = field(init=False)
+    jinja_cache: Path = field(init=False)
+    corpus: Path = field(init=False)
+    config: Path = field(init=False)
+    competency_matrix: Path = field(init=False)
+    cv_configs: Path = field(init=False)
+
+    def __post_init__(self):
+        self.templates = self.root / "templates"
+        self.data = self.root / "data"
+        self.students = self.data / "students"
+        self.ai_cache = self.data / "ai_cache"
+        self.rag_cache = self.data / "rag_cache"
+        self.jinja_cache = self.data / "jinja_cache"
+        self.corpus = self.root / "assets" / "corpus"
+        self.config = self.root / "config"
+        self.competency_matrix = self.config / "competency_matrix.json"
+        self.cv_configs = self.root / "journalism_cv"
+
+
+@dataclass(**_SLOTS)
 class UIConfig:
     """UI 配置"""
     page_title: str = "汕大新闻学院数智化教学平台"
     page_icon: str = "🎓"
     layout: str = "wide"
 
-    # 专业预设
-    major_presets: Dict = field(default_factory=lambda: {
-        "自定义": {"layout": "modern", "theme": "rose", "font": "sans"},
-        "广告学 (Agency)": {"layout": "agency", "theme": "luxury", "font": "sans"},
-        "新闻学 (Classic)": {"layout": "classic", "theme": "academic", "font": "serif"},
-        "网新 (Modern)": {"layout": "modern", "theme": "teal", "font": "sans"},
-        "广播电视 (Visual)": {"layout": "visual", "theme": "violet", "font": "sans"}
-    })
-
-    # 模板映射
-    template_map: Dict = field(default_factory=lambda: {
-        "modern": "template.html",
-        "classic": "template_classic.html",
-        "agency": "template_agency.html",
-        "visual": "template_visual.html"
-    })
-
-    # 配色主题
-    themes: List[str] = field(default_factory=lambda: [
-        "rose", "teal", "indigo", "violet", "academic", "luxury"
-    ])
-
-    # 布局选项
-    layouts: List[str] = field(default_factory=lambda: [
-        "modern", "classic", "agency", "visual"
-    ])
-
-
-@dataclass
+    # 以下默认值为模块级只读常量，所有实例共享
+    major_presets: Mapping[str, Mapping[str, str]] = field(default_factory=lambda: MAJOR_PRESETS)
+    template_map: Mapping[str, str] = field(default_factory=lambda: TEMPLATE_MAP)
+    themes: Tuple[str, ...] = field(default_factory=lambda: THEMES)
+    layouts: Tuple[str, ...] = field(default_factory=lambda: LAYOUTS)
+
+
+@dataclass(**_SLOTS)
 class RAGConfig:
     """RAG 引擎配置
 
@@ -99,6 +113,11 @@ class RAGConfig:
         chunk_overlap: 分块重叠大小
         min_chunk_length: 最小分块长度
         ngram_range: N-gram 范围，用于中文字符级匹配
+        min_df: N-gram 至少出现的分块数（默认 1：只出现在一个段落中的术语也要能检索到）
+        max_df: N-gram 最多出现的分块比例（过滤几乎处处出现的 N-gram）
+        max_features: 词表大小上限（max_df 与 max_features 只是大语料的保护上限，
+            内置课程语料约 1.2 万个特征，两者均不会生效）
+        sublinear_tf: 是否对词频取对数，平衡长短分块
         similarity_threshold: 相似度阈值
         top_k: 返回的最相关结果数量
     """
@@ -106,6 +125,10 @@ class RAGConfig:
     chunk_overlap: int = 40
     min_chunk_length: int = 10
     ngram_range: Tuple[int, int] = (2, 4)
+    min_df: int = 1
+    max_df: float = 0.95
+    max_features: Optional[int] = 200_000
+    sublinear_tf: bool = True
     similarity_threshold: float = 0.02
     top_k: int = 2
 
@@ -153,12 +176,11 @@ class Config:
             解析后的字典，如果加载失败返回空字典
         """
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return json_utils.loads(path.read_bytes())
         except FileNotFoundError:
             logger.warning(f"Config file not found: {path}")
             return {}
-        except json.JSONDecodeError as e:
+        except json_utils.JSONDecodeError as e:
             logger.warning(f"Invalid JSON in {path}: {e}")
             return {}
 
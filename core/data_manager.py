@@ -7,14 +7,24 @@
 - DataManager: 数据管理器，负责所有数据的读写和转换
 - get_data_manager: 获取全局数据管理器实例
 """
-import json
 import logging
+import os
+import re
+import sys
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict, field
 from functools import lru_cache
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from . import json_utils
 from .config import get_config
 
 # 配置日志
@@ -23,19 +33,49 @@ logger = logging.getLogger(__name__)
 # 缓存过期时间（秒）
 CACHE_TTL = 300  # 5分钟
 
+# 每个缓存最多保留的条目数（超出后淘汰最久未使用的）
+CACHE_MAX_ENTRIES = 64
+
+# Python 3.10+ 上为数据类启用 __slots__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# 学生存档文件名：config_{student_id}_v{N}.json（ID 可含下划线）
+_STUDENT_FILE_RE = re.compile(r"^config_(.+)_v(\d+)\.json$")
+
 
-@dataclass
+def _iter_strings(obj: Any):
+    """遍历嵌套的 dict/list，依次产出所有字符串（含字典键）"""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(key, str):
+                yield key
+            yield from _iter_strings(value)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            yield from _iter_strings(item)
+
+
+@dataclass(**_SLOTS)
 class CacheEntry:
     """缓存条目，包含数据和时间戳"""
     data: Any
-    timestamp: float = field(default_factory=time.time)
+    timestamp: float = field(default_factory=time.monotonic)
 
-    def is_expired(self, ttl: float = CACHE_TTL) -> bool:
-        """检查缓存是否过期"""
-        return time.time() - self.timestamp > ttl
+    def is_expired(self, now: Optional[float] = None, ttl: float = CACHE_TTL) -> bool:
+        """检查缓存是否过期
+
+        Args:
+            now: 当前的 time.monotonic() 时间，批量检查时由调用方统一传入
+            ttl: 过期时间（秒）
+        """
+        if now is None:
+            now = time.monotonic()
+        return now - self.timestamp > ttl
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class StudentProfile:
     """学生档案数据结构
 
@@ -68,21 +108,40 @@ class DataManager:
 
     def __init__(self):
         self.config = get_config()
-        self._cv_cache: Dict[str, CacheEntry] = {}
-        self._student_cache: Dict[str, CacheEntry] = {}
-
-    def _get_from_cache(self, cache: Dict[str, CacheEntry], key: str) -> Optional[Dict]:
-        """从缓存获取数据，如果过期则返回 None"""
+        self._cv_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._student_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._compiled_matrix: Dict[str, Tuple[float, List[Tuple[str, Tuple[str, ...]]]]] = {}
+        self._keyword_automata: Dict[str, Any] = {}
+        # 学生存档索引：(目录 mtime_ns, {学生 ID: [(版本号, 路径), ...]})
+        self._student_index: Optional[Tuple[int, Dict[str, List[Tuple[int, Path]]]]] = None
+        # 读取文件用的共享线程池（工作线程按需创建，跨调用复用）
+        self._io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="data-io")
+
+    def _get_from_cache(self, cache: "OrderedDict[str, CacheEntry]", key: str) -> Optional[Dict]:
+        """从缓存获取数据，如果过期则返回 None
+
+        缓存条目在所有会话间共享，保存的是不可变的 JSON 文本快照，
+        每次命中都解析出一份全新的字典（比 copy.deepcopy 快数倍），
+        编辑器原地修改嵌套列表也不会污染缓存。
+        """
         if key in cache:
             entry = cache[key]
-            if not entry.is_expired():
-                return entry.data.copy()
+            if not entry.is_expired(time.monotonic()):
+                cache.move_to_end(key)
+                return json_utils.loads(entry.data)
             del cache[key]
         return None
 
-    def _set_cache(self, cache: Dict[str, CacheEntry], key: str, data: Dict) -> None:
-        """设置缓存"""
-        cache[key] = CacheEntry(data=data.copy())
+    def _set_cache(self, cache: "OrderedDict[str, CacheEntry]", key: str, data: Dict) -> None:
+        """设置缓存，顺带清理已过期条目，超出容量时淘汰最久未使用的条目"""
+        now = time.monotonic()
+        for stale_key in [k for k, entry in cache.items() if entry.is_expired(now)]:
+            del cache[stale_key]
+
+        cache[key] = CacheEntry(data=json_utils.dumps(data), timestamp=now)
+        cache.move_to_end(key)
+        while len(cache) > CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
 
     def clear_cache(self) -> None:
         """清除所有缓存"""
@@ -130,38 +189,52 @@ class DataManager:
 
     # ==================== 学生档案操作 ====================
 
+    def _get_student_index(self) -> Dict[str, List[Tuple[int, Path]]]:
+        """获取学生存档索引（按学生 ID 分组、按版本号升序）
+
+        只做一次目录扫描，目录 mtime 未变化时直接复用上次的结果。
+        """
+        student_dir = self.config.paths.students
+        try:
+            mtime_ns = student_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+
+        if self._student_index is not None and self._student_index[0] == mtime_ns:
+            return self._student_index[1]
+
+        index: Dict[str, List[Tuple[int, Path]]] = {}
+        with os.scandir(student_dir) as entries:
+            for entry in entries:
+                match = _STUDENT_FILE_RE.match(entry.name)
+                if match and entry.is_file():
+                    s_id, version = match.groups()
+                    index.setdefault(s_id, []).append((int(version), Path(entry.path)))
+
+        for versions in index.values():
+            versions.sort()
+
+        self._student_index = (mtime_ns, index)
+        return index
+
     def load_student_history(self, student_id: str) -> List[Dict]:
         """
         加载学生的历史版本数据
         返回按版本排序的数据列表
         """
         history = []
-        student_dir = self.config.paths.students
-        
-        # 动态搜索所有版本：config_{student_id}_v*.json
-        pattern = f"config_{student_id}_v*.json"
-        files = list(student_dir.glob(pattern))
-        
-        # 按版本号排序 (v1, v2, v10)
-        def version_key(path):
-            try:
-                filename = path.stem
-                parts = filename.split('_')
-                v_part = parts[-1]  # v1
-                return int(v_part[1:])
-            except (ValueError, IndexError):
-                return 0
-                
-        files.sort(key=version_key)
-
-        for path in files:
-            data = self._load_json(path)
+        versions = self._get_student_index().get(student_id, [])
+        files = [path for _, path in versions]
+
+        # 并发读取各版本文件，map 保证结果顺序与 files 一致
+        if len(files) > 1:
+            loaded = list(self._io_pool.map(self._load_json, files))
+        else:
+            loaded = [self._load_json(path) for path in files]
+
+        for (version, _), data in zip(versions, loaded):
             if data:
-                filename = path.stem
-                parts = filename.split('_')
-                version = parts[-1]
-                
-                data['_version'] = version
+                data['_version'] = f"v{version}"
                 history.append(data)
 
         return history
@@ -172,21 +245,9 @@ class DataManager:
         自动计算 v{n+1}
         """
         student_dir = self.config.paths.students
-        pattern = f"config_{student_id}_v*.json"
-        files = list(student_dir.glob(pattern))
-        
-        max_version = 0
-        for path in files:
-            try:
-                filename = path.stem
-                parts = filename.split('_')
-                v_part = parts[-1]
-                v_num = int(v_part[1:])
-                if v_num > max_version:
-                    max_version = v_num
-            except (ValueError, IndexError):
-                pass
-        
+        versions = self._get_student_index().get(student_id, [])
+        max_version = versions[-1][0] if versions else 0
+
         next_version = f"v{max_version + 1}"
         filename = f"config_{student_id}_{next_version}.json"
         path = student_dir / filename
@@ -196,7 +257,8 @@ class DataManager:
         data_to_save['_version'] = next_version
         
         if self._save_json(path, data_to_save):
-            # 清除缓存
+            # 清除缓存（目录 mtime 精度可能不足，索引也显式失效）
+            self._student_index = None
             if student_id in self._student_cache:
                 del self._student_cache[student_id]
             return next_version
@@ -213,23 +275,9 @@ class DataManager:
         
         # 动态扫描目录下的其他存档
         try:
-            student_dir = self.config.paths.students
-            if student_dir.exists():
-                for path in student_dir.glob("config_*_v*.json"):
-                    try:
-                        filename = path.stem  # config_student_v1
-                        parts = filename.split('_')
-                        # 假设结构为 config_{id}_{version}
-                        if len(parts) >= 3:
-                            version_part = parts[-1]
-                            if version_part.startswith('v') and version_part[1:].isdigit():
-                                # 提取 ID (兼容带下划线的 ID)
-                                s_id = "_".join(parts[1:-1])
-                                
-                                if s_id not in students:
-                                    students[s_id] = f"{s_id} (存档记录)"
-                    except Exception:
-                        continue
+            for s_id in self._get_student_index():
+                if s_id not in students:
+                    students[s_id] = f"{s_id} (存档记录)"
         except Exception as e:
             print(f"Error scanning students: {e}")
             
@@ -246,33 +294,94 @@ class DataManager:
         基于简历内容计算能力维度得分
 
         算法：
-        1. 将简历数据序列化为文本
+        1. 提取简历中的全部文本
         2. 对每个能力维度，统计关键词匹配数
         3. 基准分 + 关键词加成（每个关键词+5分，上限100）
         """
         matrix = self.config.competency_matrix
-        major_config = matrix.get(major, matrix.get("journalism", {}))
-
-        dimensions = major_config.get("dimensions", {})
-        baseline = major_config.get("baseline_score", 60)
-
-        # 序列化简历内容用于搜索
-        text_blob = json.dumps(cv_data, ensure_ascii=False).lower()
+        major_key = major if major in matrix else "journalism"
+        baseline, dims = self._get_compiled_dims(major_key)
+
+        # 拼接简历中的文本用于搜索（无需完整 JSON 序列化）
+        text_blob = "\n".join(_iter_strings(cv_data)).lower()
+
+        # 统计各维度的关键词匹配数
+        automaton = self._get_keyword_automaton(major_key, dims)
+        if automaton is not None:
+            # 单次扫描：每个命中的关键词只计一次，再累加到其所属的各个维度
+            counts = [0] * len(dims)
+            for _, dim_indices in {value for _, value in automaton.iter(text_blob)}:
+                for i in dim_indices:
+                    counts[i] += 1
+        else:
+            counts = [
+                sum(1 for kw in keywords if kw in text_blob)
+                for _, keywords in dims
+            ]
 
         scores = {}
-        for dim_id, dim_info in dimensions.items():
-            label = dim_info.get("label", dim_id)
-            keywords = dim_info.get("keywords", [])
-
-            # 统计关键词匹配
-            match_count = sum(1 for kw in keywords if kw.lower() in text_blob)
-
+        for (label, _), match_count in zip(dims, counts):
             # 计算得分
             score = baseline + (match_count * 5)
             scores[label] = min(score, 100)
 
         return scores
 
+    def _get_compiled_dims(
+        self,
+        major: str
+    ) -> Tuple[float, List[Tuple[str, Tuple[str, ...]]]]:
+        """获取某专业预处理后的能力维度（按专业缓存）
+
+        Returns:
+            (基准分, [(维度名称, 小写关键词元组), ...])
+        """
+        if major not in self._compiled_matrix:
+            major_config = self.config.competency_matrix.get(major, {})
+            dims = [
+                (
+                    dim_info.get("label", dim_id),
+                    tuple(kw.lower() for kw in dim_info.get("keywords", []))
+                )
+                for dim_id, dim_info in major_config.get("dimensions", {}).items()
+            ]
+            self._compiled_matrix[major] = (major_config.get("baseline_score", 60), dims)
+
+        return self._compiled_matrix[major]
+
+    def _get_keyword_automaton(
+        self,
+        major: str,
+        dims: List[Tuple[str, Tuple[str, ...]]]
+    ) -> Optional[Any]:
+        """获取某专业全部关键词的 Aho-Corasick 自动机（按专业缓存）
+
+        自动机只需构建一次，之后对简历文本做单次线性扫描即可
+        找出所有命中的关键词。每个关键词的值为 (关键词, 所属维度下标元组)，
+        关键词在同一维度中重复出现时下标也重复，与逐个匹配的计数一致。
+        未安装 pyahocorasick 或该专业没有关键词时返回 None，
+        调用方回退到逐个关键词匹配。
+        """
+        if ahocorasick is None:
+            return None
+
+        if major not in self._keyword_automata:
+            keyword_dims: Dict[str, List[int]] = {}
+            for i, (_, kws) in enumerate(dims):
+                for kw in kws:
+                    if kw:
+                        keyword_dims.setdefault(kw, []).append(i)
+
+            automaton = None
+            if keyword_dims:
+                automaton = ahocorasick.Automaton()
+                for kw, dim_indices in keyword_dims.items():
+                    automaton.add_word(kw, (kw, tuple(dim_indices)))
+                automaton.make_automaton()
+            self._keyword_automata[major] = automaton
+
+        return self._keyword_automata[major]
+
     def get_competency_feedback(
         self,
         scores: Dict[str, float]
@@ -283,37 +392,28 @@ class DataManager:
         if not scores:
             return {"highlight": "", "suggestion": ""}
 
-        # 过滤掉非数值字段（如 'Stage'）
-        numeric_scores = {k: v for k, v in scores.items() if isinstance(v, (int, float))}
-
-        if not numeric_scores:
+        # 单次遍历同时找出最高和最低维度，跳过非数值字段（如 'Stage'）
+        best_dim = worst_dim = None
+        best = worst = 0
+        for dim, value in scores.items():
+            if not isinstance(value, (int, float)):
+                continue
+            if best_dim is None:
+                best_dim = worst_dim = dim
+                best = worst = value
+            elif value > best:
+                best_dim, best = dim, value
+            elif value < worst:
+                worst_dim, worst = dim, value
+
+        if best_dim is None:
             return {"highlight": "", "suggestion": ""}
 
-        best_dim = max(numeric_scores, key=numeric_scores.get)
-        worst_dim = min(numeric_scores, key=numeric_scores.get)
-
         return {
             "highlight": f"你在 **{best_dim}** 维度表现卓越，这与你简历中多次提到的项目经历高度契合。",
             "suggestion": f"检测到 **{worst_dim}** 是目前的相对弱项。建议结合 AI Copilot 搜索相关课程资料进行针对性强化。"
         }
 
-    # ==================== 模板操作 ====================
-
-    def load_template(self, layout: str) -> str:
-        """加载 HTML 模板"""
-        path = self.config.get_template_path(layout)
-
-        # 如果找不到，回退到默认模板
-        if not path.exists():
-            path = self.config.get_template_path("modern")
-
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            print(f"Error loading template {path}: {e}")
-            return "<html><body><h1>Template Error</h1></body></html>"
-
     # ==================== 工具方法 ====================
 
     def _load_json(self, path: Path) -> Dict:
@@ -326,12 +426,11 @@ class DataManager:
             解析后的字典，失败时返回空字典
         """
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return json_utils.loads(path.read_bytes())
         except FileNotFoundError:
             logger.debug(f"File not found: {path}")
             return {}
-        except json.JSONDecodeError as e:
+        except json_utils.JSONDecodeError as e:
             logger.error(f"JSON decode error in {path}: {e}")
             return {}
 
@@ -345,14 +444,17 @@ class DataManager:
         Returns:
             是否保存成功
         """
+        # 先写入同目录的临时文件再原子替换，读取方不会看到写了一半的文件
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            tmp_path.write_bytes(json_utils.dumps(data, indent=True).encode('utf-8'))
+            os.replace(tmp_path, path)
             logger.info(f"Saved: {path}")
             return True
         except Exception as e:
             logger.error(f"Error saving {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
             return False
 
 
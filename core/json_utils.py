@@ -0,0 +1,45 @@
+"""
+JSON 序列化工具
+
+优先使用 orjson（C 扩展，解析/序列化速度是标准库的数倍），
+未安装时自动回退到标准库 json，两种实现的输出保持一致：
+- 保留中文等非 ASCII 字符
+- 缩进固定为 2 个空格，不缩进时为紧凑格式（无多余空格）
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，统一捕获这一个即可
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """解析 JSON 字符串或 UTF-8 字节串"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """序列化为 JSON 字符串
+
+    Args:
+        obj: 要序列化的对象
+        indent: 是否以 2 空格缩进格式化输出
+
+    Returns:
+        JSON 字符串
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
@@ -14,30 +14,178 @@ Features:
 """
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
-import re
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Dict, Optional, Set, FrozenSet
+from typing import Iterable, Iterator, List, Dict, Optional, Set, FrozenSet, Tuple
 
 import numpy as np
 from numpy.typing import NDArray
 from dataclasses import dataclass, field
 
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
 try:
     import PyPDF2
 except ImportError:
     PyPDF2 = None
 
+import joblib
+import sklearn
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from .config import get_config
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 待解析文件超过该数量时才启用多进程并行提取
+PARALLEL_EXTRACT_MIN_FILES = 4
+
+# 超过该大小的文本文件通过 mmap 读取
+MMAP_MIN_FILE_SIZE = 64 * 1024
+
+# 检索结果缓存的最大条目数
+QUERY_CACHE_SIZE = 512
+
+# 索引缓存的存储格式版本，字段结构变化时递增以废弃旧缓存
+INDEX_CACHE_VERSION = 3
+
+
+def _iter_text(file_path: Path) -> Iterator[str]:
+    """逐段产出文件文本（PDF 按页产出），出错时记录日志并停止"""
+    suffix = file_path.suffix.lower()
+
+    try:
+        if suffix == '.pdf':
+            yield from _iter_pdf_pages(file_path)
+        elif suffix in ('.txt', '.md'):
+            yield _extract_text_file(file_path)
+    except Exception as e:
+        logger.error(f"Error processing {file_path}: {e}")
+
+
+def _iter_pdf_pages(file_path: Path) -> Iterator[str]:
+    """逐页产出 PDF 文本，跳过空白页
+
+    优先使用 pypdfium2（基于 PDFium 的原生解析，比 PyPDF2 快数倍），
+    未安装时回退到 PyPDF2。
+    """
+    if pypdfium2 is not None:
+        pdf = pypdfium2.PdfDocument(str(file_path))
+        try:
+            for page in pdf:
+                page_text = page.get_textpage().get_text_bounded()
+                if page_text:
+                    yield page_text.replace('\r\n', '\n')
+        finally:
+            pdf.close()
+        return
+
+    if PyPDF2 is None:
+        logger.warning("PyPDF2 not installed, skipping PDF file")
+        return
+
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        for page in reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                yield page_text
+
+
+def _extract_text_file(file_path: Path) -> str:
+    """提取文本文件内容
+
+    大文件直接从内存映射解码，省去先读成 bytes 再解码的那一份拷贝。
+    """
+    if file_path.stat().st_size < MMAP_MIN_FILE_SIZE:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                text = str(view, 'utf-8', 'ignore')
+
+    # 与文本模式读取一致：统一换行符
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
 
-@dataclass
+def _chunk_pieces(
+    pieces: Iterable[str],
+    chunk_size: int,
+    overlap: int,
+    min_length: int
+) -> Tuple[List[int], List[str]]:
+    """对逐段产出的文本做滑动窗口分块
+
+    各段之间以换行连接，结果与先拼接全文再分块完全一致，
+    但只需保留尚未切完的尾部文本，不必缓存整篇文档。
+
+    Returns:
+        (各分块起始偏移, 各分块文本)
+    """
+    step = chunk_size - overlap
+    starts: List[int] = []
+    chunks: List[str] = []
+
+    buffer = ""    # 全文中从 offset 开始、尚未切完的部分
+    offset = 0
+    pos = 0        # 下一个分块的起始偏移
+    for i, piece in enumerate(pieces):
+        buffer += piece if i == 0 else "\n" + piece
+        end = offset + len(buffer)
+
+        # 切出所有已完整可得的分块
+        while pos + chunk_size <= end:
+            chunk = buffer[pos - offset:pos - offset + chunk_size]
+            if len(chunk) > min_length:
+                starts.append(pos)
+                chunks.append(chunk)
+            pos += step
+
+        # 丢弃之后不会再用到的前缀
+        buffer = buffer[pos - offset:]
+        offset = pos
+
+    # 文末不足一个分块长度的部分
+    end = offset + len(buffer)
+    while pos < end:
+        chunk = buffer[pos - offset:pos - offset + chunk_size]
+        if len(chunk) > min_length:
+            starts.append(pos)
+            chunks.append(chunk)
+        pos += step
+
+    return starts, chunks
+
+
+def _extract_chunks(
+    file_path: Path,
+    chunk_size: int,
+    overlap: int,
+    min_length: int
+) -> Tuple[List[int], List[str]]:
+    """提取文件文本并分块
+
+    定义在模块级别，便于在进程池中执行。
+    """
+    return _chunk_pieces(_iter_text(file_path), chunk_size, overlap, min_length)
+
+
+@dataclass(frozen=True)
 class SearchResult:
     """检索结果
 
@@ -73,6 +221,18 @@ class RAGEngine:
     # 支持的文件扩展名
     SUPPORTED_EXTENSIONS: Set[str] = {'.pdf', '.txt', '.md'}
 
+    # 查询清洗时删除的字符：常见中文停用词、问号及全部 Unicode 空白
+    # （与正则 \s 一致；Unicode 空白字符的码位均不超过 U+3000）
+    _STOP_TABLE = str.maketrans('', '', '什么是的？?吗如何怎么为什么' + ''.join(
+        ch for ch in map(chr, range(0x3001)) if ch.isspace()
+    ))
+
+    # 检索结果在回复中的展示格式
+    _RESULT_TEMPLATE = (
+        "> **📑 来源：{source}** (匹配度: {score:.2f})\n"
+        "> *\"...{content}...\"*\n\n"
+    )
+
     def __init__(self, corpus_path: Optional[Path] = None):
         """初始化 RAG 引擎
 
@@ -83,18 +243,36 @@ class RAGEngine:
         self.corpus_path = corpus_path or self.config.paths.corpus
 
         self.documents: List[str] = []
-        self.filenames: List[str] = []
-        self.chunk_metadata: List[Dict] = []
+        # 分块的来源文件按列存储：文件名只在 _file_table 中保存一次，
+        # 每个分块只记录 int32 的文件编号
+        self._file_table: List[str] = []  # 至少产生一个分块的文件名
+        self._file_ids: np.ndarray = np.empty(0, dtype=np.int32)
+        # 各分块在原文中的起始偏移；结束位置为 start + len(documents[i])
+        self.chunk_starts: np.ndarray = np.empty(0, dtype=np.int64)
         self._indexed_files: Set[str] = set()  # 已索引的文件
+        # 分块去重：内容摘要 -> 文档下标；重复分块只保留一份，
+        # 其他来源文件的编号记录在 _extra_sources 中
+        self._chunk_digests: Dict[bytes, int] = {}
+        self._extra_sources: Dict[int, List[int]] = {}
 
         # 使用字符级 N-gram 匹配，完美适配中文
+        # float32 足以区分检索得分，矩阵体积和矩阵-向量乘法的内存带宽减半
         rag_config = self.config.rag
         self.vectorizer = TfidfVectorizer(
             analyzer='char_wb',
-            ngram_range=rag_config.ngram_range
+            ngram_range=rag_config.ngram_range,
+            min_df=rag_config.min_df,
+            max_df=rag_config.max_df,
+            max_features=rag_config.max_features,
+            sublinear_tf=rag_config.sublinear_tf,
+            dtype=np.float32
         )
         self.tfidf_matrix = None
 
+        # 检索结果缓存：(清洗后的查询, top_k) -> 结果；索引变化时清空
+        self._query_cache: "OrderedDict[Tuple[str, int], Tuple[SearchResult, ...]]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+
         self._index_corpus()
 
     def _index_corpus(self) -> None:
@@ -103,84 +281,223 @@ class RAGEngine:
             logger.warning(f"Corpus path does not exist: {self.corpus_path}")
             return
 
-        file_count = 0
-        for file_path in self.corpus_path.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
-                if str(file_path) not in self._indexed_files:
-                    self._process_file(file_path)
-                    self._indexed_files.add(str(file_path))
-                    file_count += 1
+        files = sorted(
+            file_path for file_path in self.corpus_path.rglob("*")
+            if file_path.is_file() and file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS
+        )
+
+        # 语料和配置均未变化时直接加载磁盘上的索引，跳过 PDF 解析和向量化
+        cache_path = self._get_index_cache_path(files)
+        if self._load_index_cache(cache_path):
+            logger.info(f"RAG Engine loaded cached index: {len(self.documents)} chunks")
+            return
+
+        pending = [fp for fp in files if str(fp) not in self._indexed_files]
+        self._add_chunks(zip(pending, self._chunk_files(pending)))
+        self._indexed_files.update(str(fp) for fp in pending)
 
         if self.documents:
-            self.tfidf_matrix = self.vectorizer.fit_transform(self.documents)
+            self._fit_matrix()
             logger.info(f"RAG Engine indexed {len(self.documents)} chunks from {len(self._indexed_files)} files")
+            self._save_index_cache(cache_path)
 
-    def _process_file(self, file_path: Path) -> None:
-        """处理单个文件
+    def add_file(self, file_path: Path) -> bool:
+        """增量索引单个文件
 
-        Args:
-            file_path: 文件路径
+        只对新文件的分块做向量化并追加到矩阵末尾，已有行保持不变。
+        沿用已拟合的词表和 IDF，不重新拟合整个语料；
+        新文件独有的 N-gram 会在下次启动全量重建（缓存键变化）时纳入。
+
+        Returns:
+            是否新增了分块
         """
+        if str(file_path) in self._indexed_files:
+            return False
+
+        start = len(self.documents)
+        self._process_file(file_path)
+        self._indexed_files.add(str(file_path))
+
+        new_documents = self.documents[start:]
+        if not new_documents:
+            # 分块可能全部与已有分块重复，来源列表已变化
+            self._clear_query_cache()
+            return False
+
+        if self.tfidf_matrix is None:
+            self._fit_matrix()
+        else:
+            self.tfidf_matrix = sparse.vstack(
+                [self.tfidf_matrix, self.vectorizer.transform(new_documents)],
+                format='csr'
+            )
+        self._clear_query_cache()
+        return True
+
+    def _fit_matrix(self) -> None:
+        """拟合向量化器并生成 TF-IDF 矩阵"""
         try:
-            text = self._extract_text(file_path)
-            if text:
-                self._chunk_text(text, file_path.name)
-                logger.debug(f"Processed: {file_path.name}")
-        except Exception as e:
-            logger.error(f"Error processing {file_path}: {e}")
-
-    def _extract_text(self, file_path: Path) -> str:
-        """从文件提取文本"""
-        suffix = file_path.suffix.lower()
+            self.tfidf_matrix = self.vectorizer.fit_transform(self.documents)
+        except ValueError as e:
+            # 分块太少时 min_df/max_df 可能互相矛盾或把词表剪空，退回不剪枝
+            logger.info(f"Vocabulary pruning not applicable ({e}), fitting without it")
+            self.vectorizer.set_params(min_df=1, max_df=1.0, max_features=None)
+            self.tfidf_matrix = self.vectorizer.fit_transform(self.documents)
+        self._clear_query_cache()
 
-        if suffix == '.pdf':
-            return self._extract_pdf(file_path)
-        elif suffix in ('.txt', '.md'):
-            return self._extract_text_file(file_path)
+    def _clear_query_cache(self) -> None:
+        """清空检索结果缓存（索引变化后调用）"""
+        with self._query_cache_lock:
+            self._query_cache.clear()
 
-        return ""
+    def _get_index_cache_path(self, files: List[Path]) -> Path:
+        """根据语料文件（路径、修改时间、大小）和分块配置计算索引缓存路径"""
+        rag_config = self.config.rag
+        hasher = hashlib.sha256()
+        hasher.update(repr((
+            INDEX_CACHE_VERSION,
+            sklearn.__version__,
+            pypdfium2 is not None,  # 不同 PDF 解析器提取的文本不同
+            rag_config.chunk_size,
+            rag_config.chunk_overlap,
+            rag_config.min_chunk_length,
+            sorted(self.vectorizer.get_params().items()),
+        )).encode('utf-8'))
+        for file_path in files:
+            stat = file_path.stat()
+            hasher.update(f"\n{file_path}|{stat.st_mtime_ns}|{stat.st_size}".encode('utf-8'))
+        return self.config.paths.rag_cache / f"{self._corpus_cache_prefix()}-{hasher.hexdigest()}.joblib"
+
+    def _corpus_cache_prefix(self) -> str:
+        """语料库目录的缓存文件名前缀：不同语料库的索引共用缓存目录，清理时互不影响"""
+        corpus_key = str(self.corpus_path.resolve()).encode('utf-8')
+        return hashlib.sha256(corpus_key).hexdigest()[:16]
+
+    def _load_index_cache(self, cache_path: Path) -> bool:
+        """从磁盘加载索引，成功返回 True"""
+        if not cache_path.exists():
+            return False
+        try:
+            # mmap_mode 让稀疏矩阵的底层数组直接映射文件，不必整体读入内存
+            state = joblib.load(cache_path, mmap_mode='r')
+            self.documents = state["documents"]
+            self._file_table = state["file_table"]
+            self._file_ids = state["file_ids"]
+            self.chunk_starts = state["chunk_starts"]
+            self._indexed_files = state["indexed_files"]
+            self._chunk_digests = state["chunk_digests"]
+            self._extra_sources = state["extra_sources"]
+            self.vectorizer = state["vectorizer"]
+            self.tfidf_matrix = state["tfidf_matrix"]
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to load RAG index cache {cache_path}: {e}")
+            return False
+
+    def _save_index_cache(self, cache_path: Path) -> None:
+        """将索引写入磁盘，并清理同一语料库旧版本的缓存"""
+        state = {
+            "documents": self.documents,
+            "file_table": self._file_table,
+            "file_ids": self._file_ids,
+            "chunk_starts": self.chunk_starts,
+            "indexed_files": self._indexed_files,
+            "chunk_digests": self._chunk_digests,
+            "extra_sources": self._extra_sources,
+            "vectorizer": self.vectorizer,
+            "tfidf_matrix": self.tfidf_matrix,
+        }
+        tmp_path = cache_path.with_suffix(".tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            joblib.dump(state, tmp_path)
+            os.replace(tmp_path, cache_path)
+            # 只清理同一语料库的旧索引，其他语料库（如调试脚本使用的目录）的缓存保留
+            for old_path in cache_path.parent.glob(f"{self._corpus_cache_prefix()}-*.joblib"):
+                if old_path != cache_path:
+                    old_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to save RAG index cache {cache_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _chunk_files(self, files: List[Path]) -> List[Tuple[List[int], List[str]]]:
+        """批量提取文件文本并分块，结果顺序与 files 一致
+
+        PDF 解析是 CPU 密集型任务，文件较多时用进程池并行处理；
+        文件较少时进程池的启动开销得不偿失，直接串行提取。
+        """
+        rag_config = self.config.rag
+        extract = functools.partial(
+            _extract_chunks,
+            chunk_size=rag_config.chunk_size,
+            overlap=rag_config.chunk_overlap,
+            min_length=rag_config.min_chunk_length
+        )
 
-    def _extract_pdf(self, file_path: Path) -> str:
-        """提取 PDF 文本"""
-        if PyPDF2 is None:
-            logger.warning("PyPDF2 not installed, skipping PDF file")
-            return ""
+        if len(files) <= PARALLEL_EXTRACT_MIN_FILES:
+            return [extract(file_path) for file_path in files]
 
-        text_parts: List[str] = []
         try:
-            with open(file_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-        except Exception as e:
-            logger.error(f"Error reading PDF {file_path}: {e}")
-            return ""
-        return "\n".join(text_parts)
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                return list(executor.map(extract, files, chunksize=4))
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"Parallel extraction failed, falling back to serial: {e}")
+            return [extract(file_path) for file_path in files]
 
-    def _extract_text_file(self, file_path: Path) -> str:
-        """提取文本文件内容"""
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
+    def _process_file(self, file_path: Path) -> None:
+        """处理单个文件
 
-    def _chunk_text(self, text: str, filename: str) -> None:
-        """将文本分块"""
-        rag_config = self.config.rag
-        chunk_size = rag_config.chunk_size
-        overlap = rag_config.chunk_overlap
-        min_length = rag_config.min_chunk_length
+        Args:
+            file_path: 文件路径
+        """
+        self._add_chunks([(file_path, self._chunk_files([file_path])[0])])
 
-        for i in range(0, len(text), chunk_size - overlap):
-            chunk = text[i:i + chunk_size]
-            if len(chunk) > min_length:
-                self.documents.append(chunk)
-                self.filenames.append(filename)
-                self.chunk_metadata.append({
-                    "start": i,
-                    "end": i + len(chunk),
-                    "filename": filename
-                })
+    def _add_chunks(self, extracted: Iterable[Tuple[Path, Tuple[List[int], List[str]]]]) -> None:
+        """将一批文件的分块加入文档列表
+
+        文件编号和起始偏移先在 Python 列表中收集，最后各拼接一次 numpy 数组，
+        避免逐个文件复制整个数组。
+        内容完全相同的分块（页眉、版权声明等）只保留第一份，
+        后续出现的文件记为该分块的附加来源。
+
+        Args:
+            extracted: (文件路径, (起始偏移列表, 分块列表)) 的序列
+        """
+        file_index = {name: i for i, name in enumerate(self._file_table)}
+        new_ids: List[int] = []
+        new_starts: List[int] = []
+        base = len(self._file_ids)
+        digests = self._chunk_digests
+
+        for file_path, (starts, chunks) in extracted:
+            if not chunks:
+                continue
+            file_id = file_index.get(file_path.name)
+            if file_id is None:
+                file_id = file_index[file_path.name] = len(self._file_table)
+                self._file_table.append(file_path.name)
+            for start, chunk in zip(starts, chunks):
+                digest = hashlib.blake2b(chunk.encode('utf-8'), digest_size=16).digest()
+                idx = digests.get(digest)
+                if idx is None:
+                    digests[digest] = len(self.documents)
+                    self.documents.append(chunk)
+                    new_ids.append(file_id)
+                    new_starts.append(start)
+                    continue
+                primary = new_ids[idx - base] if idx >= base else int(self._file_ids[idx])
+                extra = self._extra_sources.setdefault(idx, [])
+                if file_id != primary and file_id not in extra:
+                    extra.append(file_id)
+            logger.debug(f"Processed: {file_path.name}")
+
+        if new_ids:
+            self._file_ids = np.concatenate(
+                [self._file_ids, np.array(new_ids, dtype=np.int32)]
+            )
+            self.chunk_starts = np.concatenate(
+                [self.chunk_starts, np.array(new_starts, dtype=np.int64)]
+            )
 
     def query(self, user_query: str, top_k: Optional[int] = None) -> List[SearchResult]:
         """
@@ -201,31 +518,64 @@ class RAGEngine:
         # 清洗查询（移除常见停用词）
         cleaned_query = self._clean_query(user_query)
 
-        # 向量化并计算相似度
-        query_vec = self.vectorizer.transform([cleaned_query])
-        similarities = cosine_similarity(query_vec, self.tfidf_matrix).flatten()
+        # 相同的问题直接返回缓存结果
+        cache_key = (cleaned_query, top_k)
+        with self._query_cache_lock:
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                self._query_cache.move_to_end(cache_key)
+                return list(cached)
 
-        # 获取 top-k 结果
-        top_indices = similarities.argsort()[:-top_k-1:-1]
+        results = self._search(cleaned_query, top_k)
+
+        with self._query_cache_lock:
+            self._query_cache[cache_key] = tuple(results)
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+        return results
+
+    def _search(self, cleaned_query: str, top_k: int) -> List[SearchResult]:
+        """对清洗后的查询执行 TF-IDF 检索"""
+        # 向量化并计算相似度：TfidfVectorizer 默认已对每行做 L2 归一化，
+        # 余弦相似度就是一次稀疏矩阵-向量乘法
+        query_vec = self.vectorizer.transform([cleaned_query])
+        similarities = (self.tfidf_matrix @ query_vec.T).toarray().ravel()
 
-        results = []
         threshold = self.config.rag.similarity_threshold
+        if similarities.size == 0 or similarities.max() <= threshold:
+            return []
+
+        # 获取 top-k 结果：先线性划分出前 k 个，只对这 k 个排序
+        if top_k < len(similarities):
+            top_indices = np.argpartition(-similarities, top_k)[:top_k]
+        else:
+            top_indices = np.arange(len(similarities))
+        top_indices = top_indices[np.argsort(-similarities[top_indices])]
 
+        results = []
         for idx in top_indices:
             if similarities[idx] > threshold:
                 results.append(SearchResult(
-                    source=self.filenames[idx],
+                    source=self._source_name(idx),
                     content=self.documents[idx].strip(),
                     score=float(similarities[idx])
                 ))
 
         return results
 
+    def _source_name(self, idx: int) -> str:
+        """分块的来源文件名，重复分块列出全部来源"""
+        name = self._file_table[self._file_ids[idx]]
+        extra = self._extra_sources.get(idx)
+        if not extra:
+            return name
+        return "、".join([name] + [self._file_table[i] for i in extra])
+
     def _clean_query(self, query: str) -> str:
         """清洗用户查询"""
         # 移除常见中文停用词和标点
-        stopwords = r'[什么是的？?吗如何怎么为什么\s]'
-        cleaned = re.sub(stopwords, '', query)
+        cleaned = query.translate(self._STOP_TABLE)
         return cleaned if cleaned else query
 
     def generate_response(self, user_query: str) -> str:
@@ -257,22 +607,27 @@ class RAGEngine:
 
     def _format_response(self, query: str, results: List[SearchResult]) -> str:
         """格式化检索结果为回复"""
-        response = f"🤖 **基于校内课程资料的 AI 回复**：\n\n"
-        response += f"关于「**{query}**」，我在资料库中找到了相关内容：\n\n"
-
-        for i, res in enumerate(results, 1):
-            clean_content = res.content.replace('\n', ' ')
-            response += f"> **📑 来源：{res.source}** (匹配度: {res.score:.2f})\n"
-            response += f"> *\"...{clean_content}...\"*\n\n"
-
-        return response
+        parts = [
+            "🤖 **基于校内课程资料的 AI 回复**：\n\n",
+            f"关于「**{query}**」，我在资料库中找到了相关内容：\n\n",
+        ]
+        item_format = self._RESULT_TEMPLATE.format
+        parts.extend(
+            item_format(
+                source=res.source,
+                score=res.score,
+                content=res.content.replace('\n', ' ')
+            )
+            for res in results
+        )
+        return "".join(parts)
 
     def get_stats(self) -> Dict:
         """获取引擎统计信息"""
         return {
             "total_chunks": len(self.documents),
-            "total_files": len(set(self.filenames)),
-            "files": list(set(self.filenames)),
+            "total_files": len(self._file_table),
+            "files": list(self._file_table),
             "indexed": self.tfidf_matrix is not None
         }
 
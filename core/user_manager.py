@@ -3,27 +3,54 @@
 提供简单的用户注册、登录和会话管理功能
 
 Features:
-- 基于学号/工号的简单认证
+- 基于学号/工号的认证（argon2 密码哈希）
 - 用户数据持久化到 JSON 文件
 - 会话状态管理
 - 支持 Streamlit Cloud 部署
 """
 from __future__ import annotations
 
+import atexit
 import hashlib
-import json
+import hmac
 import logging
+import os
 import re
+import secrets
+import threading
 import time
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Any, List
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, asdict, field, fields
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:
+    PasswordHasher = None
+
+from . import json_utils
 from .config import get_config
 
 logger = logging.getLogger(__name__)
 
+# argon2 参数：time_cost=2、memory_cost=19 MiB，单次校验耗时控制在数十毫秒内
+_password_hasher = (
+    PasswordHasher(time_cost=2, memory_cost=19 * 1024, parallelism=1)
+    if PasswordHasher is not None else None
+)
+
+# 未安装 argon2-cffi 时回退到加盐 PBKDF2
+PBKDF2_ITERATIONS = 200_000
+
+# 用户ID：字母、数字、下划线，长度 3-20（\Z 不接受末尾换行）
+_USER_ID_RE = re.compile(r'^[a-zA-Z0-9_]{3,20}\Z')
+
+# 登录信息等非关键字段的延迟写盘间隔（秒），窗口内的多次更新合并为一次写入
+SAVE_DELAY = 0.5
+
 
 @dataclass
 class User:
@@ -42,6 +69,15 @@ class User:
             self.created_at = datetime.now().isoformat()
 
 
+# User 的字段名，用于从存储的字典（含 password_hash 等额外字段）构造 User
+_USER_FIELDS = tuple(f.name for f in fields(User))
+
+
+def _user_from_dict(data: Dict) -> User:
+    """从用户数据字典构造 User，缺失字段使用默认值"""
+    return User(**{k: data[k] for k in _USER_FIELDS if k in data})
+
+
 @dataclass
 class UserSession:
     """用户会话"""
@@ -66,14 +102,20 @@ class UserManager:
         self.config = get_config()
         self._users_path = self.config.paths.data / self.USERS_FILE
         self._users: Dict[str, Dict] = {}
+        self._lock = threading.RLock()  # 保护 _users 及延迟写盘状态
+        self._write_lock = threading.Lock()  # 串行化快照与写盘，保证后取的快照后写入
+        self._save_timer: Optional[threading.Timer] = None
+        # 按最后登录日期（YYYY-MM-DD）统计的用户数，登录时增量维护
+        self._logins_by_date: Counter = Counter()
         self._load_users()
+        # 进程退出前落盘尚未写入的延迟更新
+        atexit.register(self.flush)
 
     def _load_users(self) -> None:
         """加载用户数据"""
         if self._users_path.exists():
             try:
-                with open(self._users_path, 'r', encoding='utf-8') as f:
-                    self._users = json.load(f)
+                self._users = json_utils.loads(self._users_path.read_bytes())
                 logger.info(f"Loaded {len(self._users)} users")
             except Exception as e:
                 logger.error(f"Failed to load users: {e}")
@@ -81,26 +123,99 @@ class UserManager:
         else:
             self._users = {}
 
+        self._logins_by_date = Counter(
+            data["last_login"][:10]
+            for data in self._users.values()
+            if data.get("last_login")
+        )
+
     def _save_users(self) -> bool:
-        """保存用户数据"""
-        try:
-            self._users_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._users_path, 'w', encoding='utf-8') as f:
-                json.dump(self._users, f, ensure_ascii=False, indent=2)
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save users: {e}")
-            return False
+        """保存用户数据（先写临时文件再原子替换，避免并发写入导致文件损坏）"""
+        with self._write_lock:
+            with self._lock:
+                # 立即写盘已包含所有待写入的更新，取消延迟写入
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                # 所有对 _users 的修改都持有同一把锁，此处序列化得到的是一致的快照；
+                # 写盘在锁外进行，不阻塞登录
+                data = json_utils.dumps(self._users, indent=True).encode('utf-8')
+
+            tmp_path = self._users_path.with_suffix(self._users_path.suffix + ".tmp")
+            try:
+                self._users_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, self._users_path)
+                return True
+            except Exception as e:
+                logger.error(f"Failed to save users: {e}")
+                tmp_path.unlink(missing_ok=True)
+                return False
+
+    def _schedule_save(self) -> None:
+        """标记数据已修改，在 SAVE_DELAY 秒后合并写盘"""
+        with self._lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self) -> bool:
+        """立即写入尚未落盘的延迟更新"""
+        with self._lock:
+            if self._save_timer is None:
+                return True
+        return self._save_users()
 
     def _hash_password(self, password: str) -> str:
-        """简单密码哈希（生产环境应使用 bcrypt）"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """密码哈希（优先 argon2，未安装时使用加盐 PBKDF2）"""
+        if _password_hasher is not None:
+            return _password_hasher.hash(password)
+        salt = secrets.token_hex(16)
+        digest = hashlib.pbkdf2_hmac(
+            "sha256", password.encode(), salt.encode(), PBKDF2_ITERATIONS
+        ).hex()
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt}${digest}"
+
+    def _verify_password(self, password: str, stored: str) -> tuple[bool, bool]:
+        """
+        校验密码
+
+        Returns:
+            (是否匹配, 是否需要用当前算法重新哈希)
+        """
+        if not stored:
+            return False, False
+
+        if stored.startswith("$argon2"):
+            if _password_hasher is None:
+                logger.error("argon2-cffi is not installed, cannot verify argon2 hash")
+                return False, False
+            try:
+                _password_hasher.verify(stored, password)
+            except (VerificationError, InvalidHashError):
+                return False, False
+            return True, _password_hasher.check_needs_rehash(stored)
+
+        if stored.startswith("pbkdf2_sha256$"):
+            try:
+                _, iterations, salt, digest = stored.split("$")
+                expected = hashlib.pbkdf2_hmac(
+                    "sha256", password.encode(), salt.encode(), int(iterations)
+                ).hex()
+            except ValueError:
+                return False, False
+            if not hmac.compare_digest(expected, digest):
+                return False, False
+            return True, _password_hasher is not None or int(iterations) < PBKDF2_ITERATIONS
+
+        # 旧版无盐 sha256 哈希，校验通过后升级
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, stored), True
 
     def _validate_user_id(self, user_id: str) -> bool:
         """验证用户ID格式（学号/工号）"""
-        # 允许字母、数字、下划线，长度 3-20
-        pattern = r'^[a-zA-Z0-9_]{3,20}$'
-        return bool(re.match(pattern, user_id))
+        return _USER_ID_RE.match(user_id) is not None
 
     def register(
         self,
@@ -148,11 +263,15 @@ class UserManager:
             role=role
         )
 
-        # 保存
-        self._users[user_id] = {
+        # 保存（哈希计算较慢，放在锁外）
+        record = {
             **asdict(user),
             "password_hash": self._hash_password(password)
         }
+        with self._lock:
+            if user_id in self._users:
+                return False, "该用户ID已被注册"
+            self._users[user_id] = record
 
         if self._save_users():
             logger.info(f"User registered: {user_id}")
@@ -177,26 +296,34 @@ class UserManager:
         user_data = self._users[user_id]
 
         # 验证密码
-        if user_data.get("password_hash") != self._hash_password(password):
+        valid, needs_rehash = self._verify_password(password, user_data.get("password_hash", ""))
+        if not valid:
             return None, "密码错误"
 
-        # 更新登录信息
-        user_data["last_login"] = datetime.now().isoformat()
-        user_data["login_count"] = user_data.get("login_count", 0) + 1
-        self._save_users()
+        new_hash = self._hash_password(password) if needs_rehash else None
+
+        # 更新登录信息：延迟写盘的定时器线程会序列化同一个字典，修改必须持锁
+        with self._lock:
+            if new_hash is not None:
+                user_data["password_hash"] = new_hash
+            previous_date = user_data.get("last_login", "")[:10]
+            user_data["last_login"] = datetime.now().isoformat()
+            current_date = user_data["last_login"][:10]
+            if previous_date != current_date:
+                if previous_date:
+                    self._logins_by_date[previous_date] -= 1
+                self._logins_by_date[current_date] += 1
+            user_data["login_count"] = user_data.get("login_count", 0) + 1
+            user = _user_from_dict(user_data)
+
+        if needs_rehash:
+            # 密码哈希升级需立即落盘
+            self._save_users()
+        else:
+            # 登录统计不是关键数据，延迟合并写盘，避免每次登录都重写整个文件
+            self._schedule_save()
 
         # 创建会话
-        user = User(
-            user_id=user_data["user_id"],
-            name=user_data["name"],
-            major=user_data.get("major", "journalism"),
-            role=user_data.get("role", "student"),
-            created_at=user_data.get("created_at", ""),
-            last_login=user_data.get("last_login", ""),
-            login_count=user_data.get("login_count", 0),
-            resume_versions=user_data.get("resume_versions", [])
-        )
-
         session = UserSession(user=user, is_authenticated=True)
         logger.info(f"User logged in: {user_id}")
         return session, "登录成功！"
@@ -206,65 +333,56 @@ class UserManager:
         if user_id not in self._users:
             return None
 
-        user_data = self._users[user_id]
-        return User(
-            user_id=user_data["user_id"],
-            name=user_data["name"],
-            major=user_data.get("major", "journalism"),
-            role=user_data.get("role", "student"),
-            created_at=user_data.get("created_at", ""),
-            last_login=user_data.get("last_login", ""),
-            login_count=user_data.get("login_count", 0),
-            resume_versions=user_data.get("resume_versions", [])
-        )
+        return _user_from_dict(self._users[user_id])
 
     def update_user_resume_versions(self, user_id: str, version: str) -> bool:
         """更新用户的简历版本列表"""
         if user_id not in self._users:
             return False
 
-        versions = self._users[user_id].get("resume_versions", [])
-        if version not in versions:
+        with self._lock:
+            versions = self._users[user_id].get("resume_versions", [])
+            if version in versions:
+                return True
             versions.append(version)
             self._users[user_id]["resume_versions"] = versions
-            return self._save_users()
-        return True
+        return self._save_users()
 
     def get_all_users(self) -> List[Dict]:
         """获取所有用户（管理员功能）"""
-        return [
-            {
-                "user_id": uid,
-                "name": data.get("name", ""),
-                "major": data.get("major", ""),
-                "role": data.get("role", "student"),
-                "login_count": data.get("login_count", 0),
-                "last_login": data.get("last_login", ""),
-                "resume_count": len(data.get("resume_versions", []))
-            }
-            for uid, data in self._users.items()
-        ]
+        with self._lock:
+            return [
+                {
+                    "user_id": uid,
+                    "name": data.get("name", ""),
+                    "major": data.get("major", ""),
+                    "role": data.get("role", "student"),
+                    "login_count": data.get("login_count", 0),
+                    "last_login": data.get("last_login", ""),
+                    "resume_count": len(data.get("resume_versions", []))
+                }
+                for uid, data in self._users.items()
+            ]
 
     def get_statistics(self) -> Dict[str, Any]:
         """获取用户统计数据"""
-        total_users = len(self._users)
-        total_resumes = sum(
-            len(data.get("resume_versions", []))
-            for data in self._users.values()
-        )
-
-        # 按专业统计
-        major_counts = {}
-        for data in self._users.values():
-            major = data.get("major", "journalism")
-            major_counts[major] = major_counts.get(major, 0) + 1
-
-        # 今日活跃用户
         today = datetime.now().date().isoformat()
-        active_today = sum(
-            1 for data in self._users.values()
-            if data.get("last_login", "").startswith(today)
-        )
+
+        with self._lock:
+            total_users = len(self._users)
+            total_resumes = sum(
+                len(data.get("resume_versions", []))
+                for data in self._users.values()
+            )
+
+            # 按专业统计
+            major_counts = {}
+            for data in self._users.values():
+                major = data.get("major", "journalism")
+                major_counts[major] = major_counts.get(major, 0) + 1
+
+            # 今日活跃用户
+            active_today = self._logins_by_date[today]
 
         return {
             "total_users": total_users,
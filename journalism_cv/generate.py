@@ -1,18 +1,35 @@
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 # Try to import jinja2
 try:
-    from jinja2 import Template
+    from jinja2 import Environment, FileSystemLoader
 except ImportError:
     print("错误: 未检测到 jinja2 库。")
     print("请运行以下命令安装: pip install jinja2")
     sys.exit(1)
 
+# orjson is optional; fall back to the standard library parser
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def load_config(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(path, 'rb') as f:
+        content = f.read()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+@lru_cache(maxsize=None)
+def get_env(base_dir):
+    # One Environment per template directory; it caches compiled templates,
+    # so batch generation parses and compiles each layout only once
+    return Environment(loader=FileSystemLoader(base_dir), auto_reload=False, cache_size=16)
 
 def render_cv(config_path, template_path_ignored, output_path):
     # Load data
@@ -49,11 +66,8 @@ def render_cv(config_path, template_path_ignored, output_path):
 
     print(f"🎨 使用布局: {layout} ({os.path.basename(template_path)})")
 
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
-    
     # Render
-    template = Template(template_content)
+    template = get_env(base_dir).get_template(os.path.basename(template_path))
     rendered_html = template.render(**data)
     
     # Write output
@@ -62,6 +76,10 @@ def render_cv(config_path, template_path_ignored, output_path):
     
     print(f"✅ 简历生成成功: {os.path.basename(output_path)}")
 
+def _render_one(job):
+    # Worker entry point for the batch mode; each process keeps its own Environment cache
+    render_cv(*job)
+
 if __name__ == "__main__":
     base_dir = os.path.dirname(os.path.abspath(__file__))
     # Template path arg is now ignored in favor of internal logic, keeping sig for compat if needed or just pass None
@@ -83,13 +101,18 @@ if __name__ == "__main__":
         ]
         
         print("🚀 开始批量生成简历...")
+        jobs = []
         for conf, out in demos:
             conf_path = os.path.join(base_dir, conf)
             out_path = os.path.join(base_dir, out)
             if os.path.exists(conf_path):
-                render_cv(conf_path, dummy_template, out_path)
+                jobs.append((conf_path, dummy_template, out_path))
             else:
                 print(f"⚠️ 跳过: {conf} (文件不存在)")
+
+        # Demos are independent, render them in parallel
+        with ProcessPoolExecutor() as executor:
+            list(executor.map(_render_one, jobs))
         
         print("\n👉 请在浏览器中打开生成的 .html 文件，然后使用打印功能 (Ctrl+P) 保存为 PDF。")
         print("💡 提示: 在打印设置中，勾选 '背景图形' (Background graphics) 以确保颜色正确显示。")
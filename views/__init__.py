@@ -1,8 +1,6 @@
 # Pages module initialization
-from .resume_builder import render_resume_builder
-from .digital_twin import render_digital_twin
-from .ai_copilot import render_ai_copilot
-from .admin_dashboard import render_admin_dashboard
+# 页面模块按需导入（PEP 562）：只有实际渲染的页面才加载其依赖
+from importlib import import_module
 
 __all__ = [
     'render_resume_builder',
@@ -10,3 +8,24 @@ __all__ = [
     'render_ai_copilot',
     'render_admin_dashboard'
 ]
+
+# 导出名称 -> 所在子模块
+_MODULES = {
+    'render_resume_builder': '.resume_builder',
+    'render_digital_twin': '.digital_twin',
+    'render_ai_copilot': '.ai_copilot',
+    'render_admin_dashboard': '.admin_dashboard',
+}
+
+
+def __getattr__(name):
+    module_name = _MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -5,17 +5,14 @@
 """
 from __future__ import annotations
 
-import json
-import csv
-import io
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, List, Optional
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 
+from core import json_utils
 from core.user_manager import get_user_manager
 from core.data_manager import get_data_manager
 from core.config import get_config
@@ -107,6 +104,8 @@ def _render_metrics(stats: Dict[str, Any]) -> None:
 
 def _render_major_distribution(stats: Dict[str, Any]) -> None:
     """渲染专业分布饼图"""
+    import plotly.graph_objects as go
+
     st.subheader("专业分布")
 
     major_dist = stats.get("major_distribution", {})
@@ -142,6 +141,9 @@ def _render_major_distribution(stats: Dict[str, Any]) -> None:
 
 def _render_activity_chart(user_mgr) -> None:
     """渲染活动趋势图"""
+    import pandas as pd
+    import plotly.express as px
+
     st.subheader("用户活动")
 
     users = user_mgr.get_all_users()
@@ -169,6 +171,8 @@ def _render_activity_chart(user_mgr) -> None:
 
 def _render_user_list(user_mgr) -> None:
     """渲染用户列表"""
+    import pandas as pd
+
     st.subheader("用户列表")
 
     users = user_mgr.get_all_users()
@@ -230,7 +234,7 @@ def _render_export_section(user_mgr, data_mgr) -> None:
             report = _generate_report(stats, user_mgr)
             st.download_button(
                 "下载 report.json",
-                json.dumps(report, ensure_ascii=False, indent=2),
+                json_utils.dumps(report, indent=True),
                 file_name=f"report_{datetime.now().strftime('%Y%m%d')}.json",
                 mime="application/json"
             )
@@ -242,7 +246,7 @@ def _render_export_section(user_mgr, data_mgr) -> None:
             if resumes:
                 st.download_button(
                     "下载 resumes.json",
-                    json.dumps(resumes, ensure_ascii=False, indent=2),
+                    json_utils.dumps(resumes, indent=True),
                     file_name=f"resumes_{datetime.now().strftime('%Y%m%d')}.json",
                     mime="application/json"
                 )
@@ -251,15 +255,13 @@ def _render_export_section(user_mgr, data_mgr) -> None:
 
 
 def _export_users_csv(users: List[Dict]) -> str:
-    """导出用户数据为 CSV"""
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=[
+    """导出用户数据为 CSV（pandas 的 C 写入器，行结束符与 csv 模块一致）"""
+    import pandas as pd
+
+    df = pd.DataFrame(users, columns=[
         "user_id", "name", "major", "role", "login_count", "resume_count", "last_login"
     ])
-    writer.writeheader()
-    for user in users:
-        writer.writerow(user)
-    return output.getvalue()
+    return df.to_csv(index=False, lineterminator="\r\n")
 
 
 def _generate_report(stats: Dict, user_mgr) -> Dict:
@@ -283,13 +285,19 @@ def _collect_all_resumes(data_mgr) -> List[Dict]:
 
     students_dir = config.paths.students
     if students_dir.exists():
-        for path in students_dir.glob("config_*_v*.json"):
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    data["_source_file"] = path.name
-                    resumes.append(data)
-            except Exception:
-                continue
+        # 文件读取以 I/O 为主，多线程并行读取
+        paths = list(students_dir.glob("config_*_v*.json"))
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            resumes = [data for data in pool.map(_read_resume, paths) if data is not None]
 
     return resumes
+
+
+def _read_resume(path: Path) -> Optional[Dict]:
+    """读取单个简历文件，失败时返回 None"""
+    try:
+        data = json_utils.loads(path.read_bytes())
+        data["_source_file"] = path.name
+        return data
+    except Exception:
+        return None
@@ -5,9 +5,15 @@ AI 教学助教页面
 """
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import streamlit as st
 
-from core.rag_engine import get_rag_engine, RAGEngine
+if TYPE_CHECKING:
+    from core.rag_engine import RAGEngine
+
+# 聊天区直接展示的最近消息条数，更早的消息折叠到「历史记录」中
+RECENT_MESSAGE_COUNT = 20
 
 
 @st.cache_resource(show_spinner="正在加载知识库...")
@@ -16,7 +22,10 @@ def _get_cached_rag_engine() -> RAGEngine:
 
     使用 Streamlit 的 cache_resource 装饰器确保
     RAG 引擎只初始化一次，避免重复加载语料库。
+    rag_engine 依赖 sklearn，延迟到首次使用时再导入。
     """
+    from core.rag_engine import get_rag_engine
+
     return get_rag_engine()
 
 
@@ -81,8 +90,13 @@ def _render_rag_status():
             st.error(f"引擎状态获取失败: {e}")
 
 
+@st.fragment
 def _render_chat_interface():
-    """渲染聊天界面"""
+    """渲染聊天界面
+
+    作为 fragment 运行：提问只重跑聊天区，
+    不会连带重跑简历预览、数字孪生图表等其他标签页。
+    """
     # 初始化聊天历史
     if 'chat_history' not in st.session_state:
         st.session_state.chat_history = [
@@ -93,7 +107,17 @@ def _render_chat_interface():
         ]
 
     # 显示历史消息
-    for message in st.session_state.chat_history:
+    history = st.session_state.chat_history
+    older = history[:-RECENT_MESSAGE_COUNT]
+    recent = history[-RECENT_MESSAGE_COUNT:]
+
+    if older:
+        with st.expander(f"📜 历史记录（{len(older)} 条）"):
+            for message in older:
+                with st.chat_message(message["role"]):
+                    st.markdown(message["content"])
+
+    for message in recent:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
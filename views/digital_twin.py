@@ -3,16 +3,51 @@
 """
 from __future__ import annotations
 
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Tuple
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 
 from core.config import get_config
 from core.data_manager import get_data_manager, DataManager
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+@st.cache_data(show_spinner=False)
+def _cached_competency_scores(cv_data: Dict[str, Any], major: str) -> Dict[str, float]:
+    """按简历内容缓存能力得分
+
+    st.cache_data 以参数内容为键，简历未变化时切换标签页、
+    调整控件等重跑直接返回上次结果（返回的是副本，可放心修改）。
+    """
+    return get_data_manager().calculate_competency_scores(cv_data, major)
+
+
+def _students_dir_mtime() -> int:
+    """学生档案目录的修改时间（纳秒）
+
+    保存新版本会在目录中新增文件并更新该时间，
+    因此可作为下面两个缓存的失效键。使用整数纳秒而非浮点秒，
+    避免同一时间刻度内的两次保存得到相同的键（与 _get_student_index 一致）。
+    """
+    try:
+        return get_config().paths.students.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+@st.cache_data(show_spinner=False)
+def _cached_available_students(dir_mtime: int) -> Dict[str, str]:
+    """缓存学生档案列表（dir_mtime 仅用作缓存键）"""
+    return get_data_manager().get_available_students()
+
+
+@st.cache_data(show_spinner=False)
+def _cached_student_history(student_id: str, dir_mtime: int) -> List[Dict[str, Any]]:
+    """缓存学生的历史版本数据（dir_mtime 仅用作缓存键）"""
+    return get_data_manager().load_student_history(student_id)
+
 
 def render_digital_twin():
     """渲染数字孪生页面"""
@@ -29,7 +64,8 @@ def render_digital_twin():
     # ==================== 学生选择器 ====================
     st.subheader("👤 学生档案选择")
 
-    students = data_mgr.get_available_students()
+    dir_mtime = _students_dir_mtime()
+    students = _cached_available_students(dir_mtime)
     selected_key = st.selectbox(
         "选择要分析的学生档案",
         options=list(students.keys()),
@@ -48,23 +84,23 @@ def render_digital_twin():
         )
     else:
         # 历史存档模式
-        history_scores = _analyze_student_history(data_mgr, selected_key)
+        history_scores = _analyze_student_history(selected_key, dir_mtime)
 
     if not history_scores:
         st.warning("该学生尚无历史档案数据。")
         return
 
     # ==================== 可视化展示 ====================
-    df_history = pd.DataFrame(history_scores)
     latest_scores = history_scores[-1]
+    radar_fig, growth_fig = _build_competency_figures(history_scores, students[selected_key])
 
     col1, col2 = st.columns([1, 1])
 
     with col1:
-        _render_radar_chart(latest_scores, students[selected_key])
+        _render_radar_chart(radar_fig)
 
     with col2:
-        _render_growth_chart(df_history)
+        _render_growth_chart(growth_fig)
 
     # ==================== AI 反馈 ====================
     _render_feedback(data_mgr, latest_scores)
@@ -76,43 +112,56 @@ def _analyze_current_cv(data_mgr: DataManager) -> List[Dict[str, Any]]:
         st.session_state.cv_data = data_mgr.get_default_cv_config()
 
     cv_data = st.session_state.cv_data
-    scores = data_mgr.calculate_competency_scores(cv_data, "journalism")
+    scores = _cached_competency_scores(cv_data, "journalism")
     scores['Stage'] = "当前编辑版本"
 
     return [scores]
 
 
-def _analyze_student_history(data_mgr: DataManager, student_id: str) -> List[Dict[str, Any]]:
+def _analyze_student_history(student_id: str, dir_mtime: float) -> List[Dict[str, Any]]:
     """分析学生历史档案"""
-    history = data_mgr.load_student_history(student_id)
+    history = _cached_student_history(student_id, dir_mtime)
     scores_list = []
 
     for i, data in enumerate(history):
         version = data.get('_version', f'v{i+1}')
-        scores = data_mgr.calculate_competency_scores(data, "journalism")
+        scores = _cached_competency_scores(data, "journalism")
         scores['Stage'] = f"阶段 {version.upper()}"
         scores_list.append(scores)
 
     return scores_list
 
 
-def _render_radar_chart(scores: Dict[str, Any], title: str) -> None:
-    """渲染能力雷达图"""
-    st.subheader("1. 核心胜任力雷达 (Latest)")
-
-    categories = [k for k in scores.keys() if k != 'Stage']
-    r_values = [scores[k] for k in categories]
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatterpolar(
-        r=r_values,
-        theta=categories,
+@st.cache_data(show_spinner=False)
+def _build_competency_figures(
+    history_scores: List[Dict[str, Any]],
+    title: str
+) -> Tuple[go.Figure, go.Figure]:
+    """构建能力雷达图和成长轨迹图（按数据内容缓存）
+
+    每个能力维度直接对应一条曲线：雷达图取最后一个阶段的得分，
+    成长曲线按维度逐列取各阶段得分，无需先转换为长表。
+    """
+    # plotly 导入较慢，只在真正绘图时加载
+    import plotly.graph_objects as go
+
+    stages = [scores['Stage'] for scores in history_scores]
+    dimensions = [
+        dim for dim in dict.fromkeys(k for scores in history_scores for k in scores)
+        if dim != 'Stage'
+    ]
+    latest = history_scores[-1]
+
+    radar_fig = go.Figure()
+    radar_fig.add_trace(go.Scatterpolar(
+        r=[latest.get(dim) for dim in dimensions],
+        theta=dimensions,
         fill='toself',
         name='当前水平',
         line_color='rgb(99, 110, 250)'
     ))
 
-    fig.update_layout(
+    radar_fig.update_layout(
         polar=dict(
             radialaxis=dict(visible=True, range=[0, 100])
         ),
@@ -120,28 +169,34 @@ def _render_radar_chart(scores: Dict[str, Any], title: str) -> None:
         title=f"{title} - 能力维度图"
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    growth_fig = go.Figure()
+    for dim in dimensions:
+        growth_fig.add_trace(go.Scatter(
+            x=stages,
+            y=[scores.get(dim) for scores in history_scores],
+            mode='lines+markers',
+            name=dim
+        ))
+
+    growth_fig.update_layout(
+        title="跨学期能力增长曲线",
+        xaxis_title='Stage',
+        yaxis_title='Score',
+        legend_title_text='Dimension'
+    )
 
+    return radar_fig, growth_fig
 
-def _render_growth_chart(df_history: pd.DataFrame) -> None:
-    """渲染成长轨迹图"""
-    st.subheader("2. 成长轨迹演进 (History)")
 
-    df_melted = df_history.melt(
-        id_vars=['Stage'],
-        var_name='Dimension',
-        value_name='Score'
-    )
+def _render_radar_chart(fig: go.Figure) -> None:
+    """渲染能力雷达图"""
+    st.subheader("1. 核心胜任力雷达 (Latest)")
+    st.plotly_chart(fig, use_container_width=True)
 
-    fig = px.line(
-        df_melted,
-        x='Stage',
-        y='Score',
-        color='Dimension',
-        markers=True
-    )
 
-    fig.update_layout(title="跨学期能力增长曲线")
+def _render_growth_chart(fig: go.Figure) -> None:
+    """渲染成长轨迹图"""
+    st.subheader("2. 成长轨迹演进 (History)")
     st.plotly_chart(fig, use_container_width=True)
 
 
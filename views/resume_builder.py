@@ -8,29 +8,91 @@
 """
 from __future__ import annotations
 
-import json
 import re
-from typing import Dict, Any
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, List
 
 import streamlit as st
-from jinja2 import Template
 
-from core.config import get_config
+from core import json_utils
+from core.config import MAJOR_KEY_MAP, get_config
 from core.data_manager import get_data_manager
-from core.ai_service import extract_resume_from_text, AIServiceError
+from core.ai_service import extract_resume_from_text, get_ai_config, AIServiceError
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+# 未配置风格时的默认简历样式（只读，使用时复制）
+_DEFAULT_STYLE = MappingProxyType({
+    'layout': 'classic',
+    'theme_color': '#2563eb',
+    'font_family': 'sans',
+})
+
+# AI 流式生成时状态文字的刷新间隔（字符数）
+STREAM_STATUS_STEP = 200
+
+# 学生 ID 中需要剔除的字符
+_INVALID_ID_CHARS_RE = re.compile(r'[^a-zA-Z0-9_]')
+
+# 工作经历每行组件的 key 前缀（后接行号）
+_EXPERIENCE_WIDGET_PREFIXES = ("edit_company_", "edit_role_", "edit_exp_time_", "edit_exp_details_")
 
 
 def _sanitize_student_id(student_id: str) -> str:
     """清理学生 ID，只允许字母、数字和下划线"""
-    sanitized = re.sub(r'[^a-zA-Z0-9_]', '', student_id)
-    return sanitized[:50]
+    return _INVALID_ID_CHARS_RE.sub('', student_id)[:50]
+
+
+@st.cache_resource(show_spinner=False)
+def _get_jinja_env() -> Environment:
+    """获取共享的 Jinja2 环境
+
+    Environment 会缓存编译后的模板，每个 layout 只解析、编译一次，
+    之后的重跑只执行渲染。编译结果同时写入磁盘字节码缓存，
+    进程重启后直接加载，无需重新解析模板。
+    """
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+    config = get_config()
+    bytecode_cache = None
+    try:
+        config.paths.jinja_cache.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(config.paths.jinja_cache))
+    except OSError:
+        # 只读文件系统等情况下退回纯内存缓存
+        pass
+
+    return Environment(
+        loader=FileSystemLoader(str(config.paths.cv_configs)),
+        bytecode_cache=bytecode_cache,
+        auto_reload=False,
+        cache_size=16
+    )
+
+
+def _get_template(layout: str) -> Template:
+    """获取编译后的简历模板，找不到时回退到默认模板"""
+    filename = get_config().ui.template_map.get(layout, "template.html")
+    return _get_jinja_env().select_template([filename, "template.html"])
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_html(cv_data: Dict[str, Any], layout: str) -> str:
+    """渲染简历 HTML（按简历数据和布局缓存）
+
+    切换面板、编辑无关控件等重跑时数据未变化，直接返回上次渲染结果。
+    """
+    return _get_template(layout).render(**cv_data)
 
 
 def _validate_json_data(data: Dict[str, Any]) -> bool:
     """验证 JSON 数据结构"""
     if not isinstance(data, dict):
         return False
-    json_str = json.dumps(data)
+    json_str = json_utils.dumps(data)
     if len(json_str) > 100000:
         return False
     return True
@@ -158,15 +220,20 @@ def _render_ai_input_mode(config, data_mgr) -> None:
             status_text = st.empty()
             log_container = st.empty()
 
-            logs = []
+            # 只保留最近 5 条日志
+            logs = deque(maxlen=5)
 
             def update_log(message: str, progress: int):
-                """更新日志和进度"""
-                import time
+                """更新日志和进度
+
+                进度条每次都更新；状态和日志只在整 10% 的节点刷新，
+                中间步骤的日志会在下一个节点一起显示。
+                """
                 logs.append(f"[{time.strftime('%H:%M:%S')}] {message}")
                 progress_bar.progress(progress)
-                status_text.markdown(f"**{message}**")
-                log_container.code("\n".join(logs[-5:]), language=None)
+                if progress % 10 == 0:
+                    status_text.markdown(f"**{message}**")
+                    log_container.code("\n".join(logs), language=None)
 
             try:
                 update_log("📝 正在解析输入内容...", 10)
@@ -180,16 +247,27 @@ def _render_ai_input_mode(config, data_mgr) -> None:
 
                 update_log("🔗 正在连接 AI 服务...", 40)
 
-                # 导入并获取配置信息
-                from core.ai_service import get_ai_config
+                # 获取配置信息
                 ai_config = get_ai_config()
                 update_log(f"🤖 模型: {ai_config.model}", 50)
                 update_log(f"🌐 API: {ai_config.base_url[:30]}...", 55)
 
                 update_log("⏳ 正在调用 AI 分析内容（请稍候）...", 60)
 
-                # 调用 AI 服务提取简历数据
-                extracted_data = extract_resume_from_text(user_input, major_key)
+                # 调用 AI 服务提取简历数据（流式接收，实时显示进度）
+                # 每收到 STREAM_STATUS_STEP 个字符才刷新一次状态，避免每个 token 都发一条消息
+                last_step = 0
+
+                def on_stream(received: int):
+                    nonlocal last_step
+                    step = received // STREAM_STATUS_STEP
+                    if step > last_step:
+                        last_step = step
+                        status_text.markdown(f"**⏳ AI 正在生成... 已接收 {received} 字符**")
+
+                extracted_data = extract_resume_from_text(
+                    user_input, major_key, on_progress=on_stream
+                )
 
                 update_log("✨ AI 响应成功，正在解析结果...", 80)
 
@@ -197,7 +275,11 @@ def _render_ai_input_mode(config, data_mgr) -> None:
                 profile = extracted_data.get('profile', {})
                 edu_count = len(extracted_data.get('education', []))
                 exp_count = len(extracted_data.get('experience', []))
-                skill_count = sum(len(v) for v in extracted_data.get('skills', {}).values() if isinstance(v, list))
+                # AI 返回的结构未经校验：skills 不是字典时按 0 计，非列表的值跳过
+                skills = extracted_data.get('skills')
+                skill_count = sum(
+                    len(v) for v in skills.values() if isinstance(v, list)
+                ) if isinstance(skills, dict) else 0
                 award_count = len(extracted_data.get('awards', []))
 
                 update_log(f"👤 提取到个人信息: {profile.get('name', '未知')}", 85)
@@ -212,7 +294,6 @@ def _render_ai_input_mode(config, data_mgr) -> None:
                 st.session_state.cv_data = extracted_data
 
                 # 清除进度显示
-                import time
                 time.sleep(0.5)
                 progress_container.empty()
 
@@ -307,50 +388,77 @@ def _render_json_editor_mode(config, data_mgr) -> None:
 
     with col_editor:
         st.markdown("**数据编辑**")
-        st.caption("直接编辑 JSON 数据，修改后自动同步到预览")
-
-        edited_data_str = st.text_area(
-            "JSON",
-            value=json.dumps(st.session_state.cv_data, indent=2, ensure_ascii=False),
-            height=500,
-            key="res_json_editor",
-            label_visibility="collapsed"
-        )
+        st.caption("直接编辑 JSON 数据，点击「应用更改」后同步到预览")
+
+        # 先注入样式，使编辑器显示的内容与预览使用的数据一致
+        st.session_state.cv_data['meta'] = st.session_state.get('cv_style') or dict(_DEFAULT_STYLE)
+        serialized = json_utils.dumps(st.session_state.cv_data, indent=True)
+
+        # 带 key 的组件会忽略新的 value：简历数据在别处被替换（加载示例、AI 提炼、
+        # 应用更改）后，需在创建组件前把最新内容写入组件状态，避免提交旧文本覆盖新数据
+        # 「格式化」的结果同样只能在创建组件前写入
+        formatted_text = st.session_state.pop("_json_editor_formatted", None)
+        if formatted_text is not None:
+            st.session_state.res_json_editor = formatted_text
+        elif (
+            "res_json_editor" not in st.session_state
+            or st.session_state.get("_json_editor_synced") != serialized
+        ):
+            st.session_state.res_json_editor = serialized
+            st.session_state._json_editor_synced = serialized
+
+        # 放在表单内：输入过程中不触发重跑，提交时才解析和渲染
+        with st.form("res_json_form", clear_on_submit=False):
+            edited_data_str = st.text_area(
+                "JSON",
+                height=500,
+                key="res_json_editor",
+                label_visibility="collapsed"
+            )
+            col_apply, col_format = st.columns(2)
+            with col_apply:
+                applied = st.form_submit_button("✅ 应用更改", use_container_width=True)
+            with col_format:
+                format_clicked = st.form_submit_button("🔧 格式化 JSON", use_container_width=True)
 
         # 验证并更新
-        try:
-            current_data = json.loads(edited_data_str)
-            st.session_state.cv_data = current_data
-            st.success("✓ JSON 格式正确", icon="✅")
-        except json.JSONDecodeError as e:
-            st.error(f"JSON 格式错误: {str(e)}")
-
-        # 格式化按钮
-        if st.button("🔧 格式化 JSON", use_container_width=True):
+        # 文本与当前数据的序列化结果一致时内容未改动，无需重新解析
+        if applied:
             try:
-                formatted = json.dumps(json.loads(edited_data_str), indent=2, ensure_ascii=False)
-                st.session_state.cv_data = json.loads(formatted)
-                st.rerun()
-            except json.JSONDecodeError:
+                parsed = json_utils.loads(edited_data_str) if edited_data_str != serialized else None
+            except json_utils.JSONDecodeError as e:
+                st.error(f"JSON 格式错误: {str(e)}")
+            else:
+                # 顶层必须是对象：列表等其他类型写入 cv_data 后，每次重跑都会在注入样式时报错
+                if parsed is not None and not _validate_json_data(parsed):
+                    st.error("数据格式无效：顶层必须是 JSON 对象，且内容不能过大")
+                else:
+                    if parsed is not None:
+                        st.session_state.cv_data = parsed
+                    st.success("✓ JSON 格式正确", icon="✅")
+
+        # 格式化：只整理编辑器中的文本，不应用到简历数据
+        if format_clicked:
+            try:
+                formatted_text = json_utils.dumps(json_utils.loads(edited_data_str), indent=True)
+            except json_utils.JSONDecodeError:
                 st.error("无法格式化：JSON 格式错误")
+            else:
+                if formatted_text != edited_data_str:
+                    st.session_state._json_editor_formatted = formatted_text
+                    st.rerun()
 
     with col_preview:
         st.markdown("**实时预览**")
 
         # 获取样式配置
-        style = st.session_state.get('cv_style', {
-            'layout': 'classic',
-            'theme_color': '#2563eb',
-            'font_family': 'sans'
-        })
+        style = st.session_state.get('cv_style') or dict(_DEFAULT_STYLE)
 
         current_data = st.session_state.cv_data
         current_data['meta'] = style
 
         # 加载并渲染模板
-        template_content = data_mgr.load_template(style['layout'])
-        template = Template(template_content)
-        html_output = template.render(**current_data)
+        html_output = _render_html(current_data, style['layout'])
 
         # 下载按钮
         st.download_button(
@@ -451,19 +559,13 @@ def _render_preview_section(config, data_mgr) -> None:
     current_data = st.session_state.cv_data
 
     # 获取样式配置
-    style = st.session_state.get('cv_style', {
-        'layout': 'classic',
-        'theme_color': '#2563eb',
-        'font_family': 'sans'
-    })
+    style = st.session_state.get('cv_style') or dict(_DEFAULT_STYLE)
 
     # 注入 Meta 配置
     current_data['meta'] = style
 
     # 加载并渲染模板
-    template_content = data_mgr.load_template(style['layout'])
-    template = Template(template_content)
-    html_output = template.render(**current_data)
+    html_output = _render_html(current_data, style['layout'])
 
     # 下载按钮
     st.download_button(
@@ -498,7 +600,7 @@ def _render_preview_section(config, data_mgr) -> None:
             new_location = st.text_input("期望地点", value=profile.get('location', ''), key="edit_location")
 
         # 更新数据
-        st.session_state.cv_data['profile'] = {
+        _set_if_changed(st.session_state.cv_data, 'profile', {
             **profile,
             'name': new_name,
             'phone': new_phone,
@@ -506,7 +608,7 @@ def _render_preview_section(config, data_mgr) -> None:
             'title': new_title,
             'wechat': new_wechat,
             'location': new_location
-        }
+        })
 
     # 教育经历
     with st.expander("🎓 教育经历", expanded=False):
@@ -533,12 +635,12 @@ def _render_preview_section(config, data_mgr) -> None:
             )
 
             # 更新数据
-            st.session_state.cv_data['education'][i] = {
+            _set_if_changed(st.session_state.cv_data['education'], i, {
                 'school': new_school,
                 'degree': new_degree,
                 'time': new_time,
-                'details': [d.strip() for d in new_details.split('\n') if d.strip()]
-            }
+                'details': _parse_lines(new_details)
+            })
 
             if i < len(education_list) - 1:
                 st.markdown("---")
@@ -550,6 +652,7 @@ def _render_preview_section(config, data_mgr) -> None:
         if not experience_list:
             st.info("暂无工作经历，点击下方按钮添加")
 
+        delete_index = None
         for i, exp in enumerate(experience_list):
             st.markdown(f"**经历 {i+1}**")
             col1, col2 = st.columns(2)
@@ -569,21 +672,31 @@ def _render_preview_section(config, data_mgr) -> None:
                 height=100
             )
 
-            st.session_state.cv_data['experience'][i] = {
+            _set_if_changed(st.session_state.cv_data['experience'], i, {
                 'company': new_company,
                 'role': new_role,
                 'time': new_time,
-                'details': [d.strip() for d in new_details.split('\n') if d.strip()]
-            }
+                'details': _parse_lines(new_details)
+            })
 
             # 删除按钮
             if st.button(f"🗑️ 删除经历 {i+1}", key=f"del_exp_{i}"):
-                st.session_state.cv_data['experience'].pop(i)
-                st.rerun()
+                delete_index = i
 
             if i < len(experience_list) - 1:
                 st.markdown("---")
 
+        # 遍历结束后再删除，避免在循环中修改正在遍历的列表
+        if delete_index is not None:
+            row_count = len(st.session_state.cv_data['experience'])
+            del st.session_state.cv_data['experience'][delete_index]
+            # 组件 key 按位置编号：删除后第 i 行会沿用原第 i 行的组件状态并写回简历，
+            # 因此清除被删行及其后各行的组件状态，让它们按新数据重新初始化
+            for j in range(delete_index, row_count):
+                for prefix in _EXPERIENCE_WIDGET_PREFIXES:
+                    st.session_state.pop(f"{prefix}{j}", None)
+            st.rerun()
+
         # 添加新经历
         if st.button("➕ 添加工作经历", key="add_exp"):
             st.session_state.cv_data.setdefault('experience', []).append({
@@ -619,11 +732,11 @@ def _render_preview_section(config, data_mgr) -> None:
             height=80
         )
 
-        st.session_state.cv_data['skills'] = {
-            'professional': [s.strip() for s in professional.split('\n') if s.strip()],
-            'software': [s.strip() for s in software.split('\n') if s.strip()],
-            'languages': [s.strip() for s in languages.split('\n') if s.strip()]
-        }
+        _set_if_changed(st.session_state.cv_data, 'skills', {
+            'professional': _parse_lines(professional),
+            'software': _parse_lines(software),
+            'languages': _parse_lines(languages)
+        })
 
     # 获奖情况
     with st.expander("🏆 获奖情况", expanded=False):
@@ -636,57 +749,93 @@ def _render_preview_section(config, data_mgr) -> None:
             height=100
         )
 
-        st.session_state.cv_data['awards'] = [a.strip() for a in new_awards.split('\n') if a.strip()]
+        _set_if_changed(st.session_state.cv_data, 'awards', _parse_lines(new_awards))
 
-    # 作品集
+    # 作品集：字段都是单行文本，用一个表格编辑器代替逐行的输入框
     with st.expander("📂 作品集", expanded=False):
-        portfolio_list = current_data.get('portfolio', [])
-
-        if not portfolio_list:
-            st.info("暂无作品，点击下方按钮添加")
-
-        for i, work in enumerate(portfolio_list):
-            st.markdown(f"**作品 {i+1}**")
-            col1, col2 = st.columns(2)
-
-            with col1:
-                new_title = st.text_input("作品名称", value=work.get('title', ''), key=f"edit_work_title_{i}")
-                new_role = st.text_input("你的角色", value=work.get('role', ''), key=f"edit_work_role_{i}")
-
-            with col2:
-                new_link = st.text_input("作品链接", value=work.get('link', ''), key=f"edit_work_link_{i}")
-                new_desc = st.text_input("简短描述", value=work.get('desc', ''), key=f"edit_work_desc_{i}")
-
-            st.session_state.cv_data['portfolio'][i] = {
-                'title': new_title,
-                'role': new_role,
-                'link': new_link,
-                'desc': new_desc
-            }
-
-            if st.button(f"🗑️ 删除作品 {i+1}", key=f"del_work_{i}"):
-                st.session_state.cv_data['portfolio'].pop(i)
-                st.rerun()
-
-            if i < len(portfolio_list) - 1:
-                st.markdown("---")
+        _render_portfolio_editor(current_data.get('portfolio', []))
+
+
+# 作品集表格的列：字段名 -> 列标题
+_PORTFOLIO_COLUMNS = MappingProxyType({
+    'title': "作品名称",
+    'role': "你的角色",
+    'link': "作品链接",
+    'desc': "简短描述",
+})
+
+
+def _render_portfolio_editor(portfolio_list: List[Dict[str, Any]]) -> None:
+    """用 st.data_editor 编辑作品集（支持增删行）
+
+    data_editor 的输入必须在多次重跑间保持不变，否则组件状态会被重置。
+    因此以 _portfolio_base 作为固定的编辑起点，编辑结果只写回 cv_data；
+    仅当作品集在别处被修改（AI 提炼、JSON 编辑器）时才重建起点。
+
+    表格只包含四个文本列：编辑结果按行号合并回原作品字典，保留其他字段；
+    所有字段都为空的行（例如新增后未填写的行）不写入简历数据。
+    """
+    import pandas as pd
+
+    columns = list(_PORTFOLIO_COLUMNS)
+    if (
+        '_portfolio_base' not in st.session_state
+        or st.session_state.get('_portfolio_output') != portfolio_list
+    ):
+        # 起点对应的原作品字典，行号即 DataFrame 的索引
+        st.session_state._portfolio_source = [dict(work) for work in portfolio_list]
+        st.session_state._portfolio_base = pd.DataFrame(
+            [{k: work.get(k, '') for k in columns} for work in portfolio_list],
+            columns=columns
+        )
+        st.session_state._portfolio_version = st.session_state.get('_portfolio_version', 0) + 1
+
+    edited = st.data_editor(
+        st.session_state._portfolio_base,
+        key=f"edit_portfolio_{st.session_state._portfolio_version}",
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            k: st.column_config.TextColumn(label) for k, label in _PORTFOLIO_COLUMNS.items()
+        }
+    )
 
-        if st.button("➕ 添加作品", key="add_work"):
-            st.session_state.cv_data.setdefault('portfolio', []).append({
-                'title': '待填写',
-                'role': '待填写',
-                'link': '',
-                'desc': '待填写'
-            })
-            st.rerun()
+    source = st.session_state._portfolio_source
+    rows = []
+    for index, record in zip(edited.index, edited.fillna('').to_dict('records')):
+        if not any(str(value).strip() for value in record.values()):
+            continue
+        # 新增行的索引超出原列表范围，直接使用表格中的字段
+        if not (pd.api.types.is_integer(index) and 0 <= index < len(source)):
+            rows.append(record)
+            continue
+        original = source[index]
+        row = dict(original)
+        for key, value in record.items():
+            if value != (original.get(key) or ''):
+                row[key] = value
+        rows.append(row)
+
+    st.session_state._portfolio_output = rows
+    _set_if_changed(st.session_state.cv_data, 'portfolio', rows)
+
+
+def _parse_lines(text: str) -> List[str]:
+    """将多行文本解析为去除首尾空白的非空行列表"""
+    return [line for line in map(str.strip, text.splitlines()) if line]
+
+
+def _set_if_changed(container, key, value) -> None:
+    """仅在内容变化时写回简历数据，未改动的字段保留原对象"""
+    try:
+        if container[key] == value:
+            return
+    except (KeyError, IndexError):
+        pass
+    container[key] = value
 
 
 def _get_major_key(major_display_name: str) -> str:
     """将显示名称转换为专业 key"""
-    major_map = {
-        "新闻学": "journalism",
-        "广告学": "advertising",
-        "网络与新媒体": "new_media",
-        "广播电视学": "broadcasting"
-    }
-    return major_map.get(major_display_name, "journalism")
+    return MAJOR_KEY_MAP.get(major_display_name, "journalism")